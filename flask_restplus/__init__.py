@@ -3,7 +3,7 @@ from __future__ import absolute_import
 
 from . import fields, reqparse, apidoc, inputs, cors
 from .api import Api  # noqa
-from .marshalling import marshal, marshal_with, marshal_with_field  # noqa
+from .marshalling import marshal, marshal_json, marshal_many, marshal_with, marshal_with_field  # noqa
 from .mask import Mask
 from .model import Model, OrderedModel, SchemaModel  # noqa
 from .namespace import Namespace  # noqa
@@ -19,6 +19,8 @@ __all__ = (
     'Resource',
     'apidoc',
     'marshal',
+    'marshal_json',
+    'marshal_many',
     'marshal_with',
     'marshal_with_field',
     'Mask',
@@ -2,18 +2,35 @@
 from __future__ import unicode_literals
 
 import difflib
+import gc
+import gzip
+import hashlib
 import inspect
+import io
 from itertools import chain
+import json
 import logging
 import operator
+import os
 import re
 import six
 import sys
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps, partial
 from types import MethodType
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 from flask import url_for, request, current_app
 from flask import make_response as original_flask_make_response
 from flask.helpers import _endpoint_from_view_func
@@ -27,14 +44,15 @@ from werkzeug.exceptions import HTTPException, MethodNotAllowed, NotFound, NotAc
 from werkzeug.wrappers import BaseResponse
 
 from . import apidoc
-from .model import Model
-from .mask import ParseError, MaskError
+from .marshalling import Marshalled, plan_for
+from .model import Model, ModelBase, RawModel
+from .mask import ParseError, MaskError, DEFAULT_CACHE_SIZE as DEFAULT_MASK_CACHE_SIZE, cache as mask_cache
 from .namespace import Namespace
 from .postman import PostmanCollectionV1
 from .resource import Resource
-from .swagger import Swagger
+from .swagger import Swagger, CHECKSUM_KEY, checksum, is_documented
 from .utils import default_id, camel_to_dash, unpack
-from .representations import output_json
+from .representations import output_json, dumps
 from ._http import HTTPStatus
 
 RE_RULES = re.compile('(<.*>)')
@@ -98,7 +116,7 @@ class Api(object):
             tags=None, prefix='', ordered=False,
             default_mediatype='application/json', decorators=None,
             catch_all_404s=False, serve_challenge_on_401=False, format_checker=None,
-            **kwargs):
+            compile_validators=None, specs_file=None, **kwargs):
         self.version = version
         self.title = title or 'API'
         self.description = description
@@ -113,6 +131,7 @@ class Api(object):
         self.default_id = default_id
         self.ordered = ordered
         self._validate = validate
+        self._compile_validators = compile_validators
         self._doc = doc
         self._doc_view = None
         self._default_error_handler = None
@@ -123,8 +142,13 @@ class Api(object):
             MaskError: mask_error_handler,
         }
         self._schema = None
+        self._schema_fragments = {}
+        self._specs_file = specs_file
+        self._namespace_schemas = {}
+        self._serialized_schemas = {}
         self.models = {}
         self._refresolver = None
+        self._validation_executor = None
         self.format_checker = format_checker
         self.namespaces = []
         self.default_namespace = self.namespace(default, default_label,
@@ -207,9 +231,69 @@ class Api(object):
                 self._register_view(app, resource, namespace, *urls, **kwargs)
 
         self._validate = self._validate if self._validate is not None else app.config.get('RESTPLUS_VALIDATE', False)
+        if self._compile_validators is None:
+            self._compile_validators = app.config.get('RESTPLUS_COMPILE_VALIDATORS', False)
         self._register_apidoc(app, url_prefix=url_prefix)
         app.config.setdefault('RESTPLUS_MASK_HEADER', 'X-Fields')
         app.config.setdefault('RESTPLUS_MASK_SWAGGER', True)
+        app.config.setdefault('RESTPLUS_MASK_CACHE_SIZE', DEFAULT_MASK_CACHE_SIZE)
+        mask_cache.resize(app.config['RESTPLUS_MASK_CACHE_SIZE'])
+        # Blueprint resources are only routed once the blueprint registration is complete
+        if app.config.get('RESTPLUS_WARMUP', False) and not self.blueprint:
+            self.warmup(app)
+
+    def warmup(self, app=None, freeze=None):
+        '''
+        Eagerly compute everything otherwise computed on the first requests.
+
+        This resolves all models and compiles their marshalling plans,
+        builds their schemas and validators and renders the namespaces Swagger paths.
+        The full Swagger specifications depend on the request (ie. ``basePath`` and ``host``)
+        so they are left to the first request.
+        Call it once all resources are registered, in the master process of a pre-forking server
+        (ie. ``gunicorn --preload``) so workers inherit the results.
+        This is done on :meth:`init_app` when ``RESTPLUS_WARMUP`` is set.
+
+        :param flask.Flask app: the application (default to the current one)
+        :param bool freeze: Move everything to the permanent garbage collector generation
+            so forked workers keep sharing the memory pages (requires Python 3.7+).
+            Default to the ``RESTPLUS_WARMUP_GC_FREEZE`` configuration.
+        '''
+        if app is None:
+            app = self.app if self.app is not None and not self.blueprint else current_app._get_current_object()
+        with app.test_request_context():
+            for model in list(self.models.values()):
+                model.__schema__
+                if isinstance(model, RawModel):
+                    plan_for(model.resolved)
+            # Resources validate their own copy of the expected models
+            for model in chain(self.models.values(), self._expected_models()):
+                model.validator(self.refresolver, self.format_checker, self._compile_validators)
+            swagger = Swagger(self, self._schema_fragments)
+            for ns in self.namespaces:
+                if ns not in self._schema_fragments:
+                    self._schema_fragments[ns] = swagger.serialize_namespace(ns)
+
+        if freeze is None:
+            freeze = app.config.get('RESTPLUS_WARMUP_GC_FREEZE', False)
+        if freeze:
+            if hasattr(gc, 'freeze'):
+                gc.collect()
+                gc.freeze()
+            else:
+                log.warning('gc.freeze() requires Python 3.7+')
+
+    def _expected_models(self):
+        '''Iterate over the models expected by the resources methods'''
+        for ns in self.namespaces:
+            for resource, urls, kwargs in ns.resources:
+                for method in resource.methods or ():
+                    doc = getattr(getattr(resource, method.lower(), None), '__apidoc__', None) or {}
+                    for expect in doc.get('expect', []):
+                        if isinstance(expect, list) and len(expect) == 1:
+                            expect = expect[0]
+                        if isinstance(expect, ModelBase):
+                            yield expect
 
     def __getattr__(self, name):
         try:
@@ -231,6 +315,12 @@ class Api(object):
 
     def _register_apidoc(self, app, url_prefix=None):
         conf = app.extensions.setdefault('restplus', {})
+        conf.setdefault('apis', []).append(self)
+        if not conf.get('cli_registered', False) and hasattr(app, 'cli'):
+            # flask.cli is only available on Flask>=0.11
+            from .cli import cli
+            app.cli.add_command(cli)
+            conf['cli_registered'] = True
         if not conf.get('apidoc_registered', False):
             if not url_prefix and self.blueprint:
                 url_prefix = self.blueprint.url_prefix
@@ -249,6 +339,25 @@ class Api(object):
                 resource_class_args=(self, )
             )
             self.endpoints.add(endpoint)
+        if self._add_specs and self._doc:
+            # The per-namespace specifications are only loaded by the documentation UI
+            self._register_view(
+                app_or_blueprint,
+                SwaggerIndexView,
+                self.default_namespace,
+                '/swagger/index.json',
+                endpoint=str('specs_index'),
+                resource_class_args=(self, )
+            )
+            self._register_view(
+                app_or_blueprint,
+                SwaggerNamespaceView,
+                self.default_namespace,
+                '/swagger/namespaces/<namespace>.json',
+                endpoint=str('specs_namespace'),
+                resource_class_args=(self, )
+            )
+            self.endpoints.update(('specs_index', 'specs_namespace'))
 
     def _register_doc(self, app_or_blueprint):
         if self._add_specs and self._doc:
@@ -262,6 +371,7 @@ class Api(object):
 
         kwargs['endpoint'] = endpoint
         self.endpoints.add(endpoint)
+        self._invalidate_schema(namespace)
 
         if self.app is not None:
             self._register_view(self.app, resource, namespace, *urls, **kwargs)
@@ -349,6 +459,9 @@ class Api(object):
         )
         if mediatype is None:
             raise NotAcceptable()
+        if isinstance(data, Marshalled) and self.representations.get(mediatype) is not output_json:
+            # Only JSON responses are encoded straight from the objects
+            data = data.marshal()
         if mediatype in self.representations:
             resp = self.representations[mediatype](data, *args, **kwargs)
             resp.headers['Content-Type'] = mediatype
@@ -423,6 +536,7 @@ class Api(object):
             # Associate ns with prefix-path
             if path is not None:
                 self.ns_paths[ns] = path
+            self._invalidate_schema(ns)
         # Register resources
         for resource, urls, kwargs in ns.resources:
             self.register_resource(ns, resource, *self.ns_urls(ns, urls), **kwargs)
@@ -501,7 +615,10 @@ class Api(object):
         '''
         if not self._schema:
             try:
-                self._schema = Swagger(self).as_dict()
+                if self._specs_file:
+                    self._schema = self._load_schema(self._specs_file)
+                if not self._schema:
+                    self._schema = Swagger(self, self._schema_fragments).as_dict()
             except Exception:
                 # Log the source exception for debugging purpose
                 # and return an error message
@@ -510,6 +627,78 @@ class Api(object):
                 return {'error': msg}
         return self._schema
 
+    def namespace_schema(self, name):
+        '''
+        The Swagger specifications restricted to a single namespace:
+        its paths and tags and the definitions they reference.
+
+        :param str name: the namespace name
+        :returns dict: the schema as a serializable dict or ``None`` if there is no such documented namespace
+        '''
+        if name not in self._namespace_schemas:
+            ns = next((ns for ns in self.namespaces if ns.name == name and is_documented(ns)), None)
+            if ns is None:
+                return None
+            try:
+                self._namespace_schemas[name] = Swagger(self, self._schema_fragments).as_dict(namespaces=[ns])
+            except Exception:
+                msg = 'Unable to render schema'
+                log.exception(msg)
+                return {'error': msg}
+        return self._namespace_schemas[name]
+
+    @property
+    def specs_index(self):
+        '''
+        An index of the per-namespace Swagger specifications
+
+        :returns dict: the API title and version, the full specifications url
+            and each documented namespace specifications url
+        '''
+        return {
+            'title': six.text_type(self.title),
+            'version': six.text_type(self.version),
+            'specs': self.specs_url,
+            'namespaces': [
+                {
+                    'name': ns.name,
+                    'description': ns.description,
+                    'url': url_for(self.endpoint('specs_namespace'), namespace=ns.name, _external=True),
+                } for ns in self.namespaces if is_documented(ns)
+            ],
+        }
+
+    def _invalidate_schema(self, namespace=None):
+        '''
+        Drop the rendered specifications so they are merged again on next access.
+
+        :param Namespace namespace: the namespace whose cached paths fragment is outdated
+        '''
+        self.__dict__.pop('__schema__', None)
+        self._schema = None
+        self._namespace_schemas.clear()
+        if namespace is not None:
+            self._schema_fragments.pop(namespace, None)
+
+    def _load_schema(self, filename):
+        '''Load exported specifications if they are still matching the registered resources and models'''
+        filename = os.path.join(current_app.root_path, filename)
+        try:
+            with open(filename) as specs_file:
+                schema = json.load(specs_file)
+        except (IOError, ValueError):
+            log.warning('Unable to load specifications from %s', filename, exc_info=True)
+            return None
+        try:
+            outdated = schema.pop(CHECKSUM_KEY, None) != checksum(self)
+        except Exception:
+            log.warning('Unable to check specifications from %s', filename, exc_info=True)
+            return None
+        if outdated:
+            log.warning('Specifications from %s are outdated and ignored', filename)
+            return None
+        return schema
+
     @property
     def _own_and_child_error_handlers(self):
         rv = {}
@@ -734,10 +923,29 @@ class Api(object):
 
     @property
     def refresolver(self):
+        '''
+        The resolver for the models references (``#/definitions/<name>``) used by payload validation.
+
+        Definitions are resolved lazily from the API models
+        so validation doesn't require to render the whole specifications.
+        '''
         if not self._refresolver:
-            self._refresolver = RefResolver.from_schema(self.__schema__)
+            self._refresolver = RefResolver.from_schema({'definitions': ModelDefinitions(self)})
         return self._refresolver
 
+    @property
+    def validation_executor(self):
+        '''
+        The thread pool validating large collection payloads by chunks
+        (``None`` unless ``RESTPLUS_VALIDATION_WORKERS`` is set)
+        '''
+        workers = current_app.config.get('RESTPLUS_VALIDATION_WORKERS')
+        if not workers:
+            return None
+        if not self._validation_executor:
+            self._validation_executor = ThreadPoolExecutor(max_workers=workers)
+        return self._validation_executor
+
     @staticmethod
     def _blueprint_setup_add_url_rule_patch(blueprint_setup, rule, endpoint=None, view_func=None, **options):
         '''
@@ -849,16 +1057,144 @@ class Api(object):
         return url_for(endpoint, **values)
 
 
+class ModelDefinitions(Mapping):
+    '''
+    A lazy read-only mapping of an API models schemas by name.
+
+    Schemas are only computed when looked up
+    and models registered later are available as soon as they are added.
+
+    :param Api api: the API owning the models
+    '''
+    def __init__(self, api):
+        self.api = api
+
+    def __getitem__(self, name):
+        return self.api.models[name].__schema__
+
+    def __iter__(self):
+        return iter(self.api.models)
+
+    def __len__(self):
+        return len(self.api.models)
+
+
+def _gzip_compress(data):
+    '''Compress with gzip without any timestamp so compressed specifications are the same bytes everywhere'''
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=9, mtime=0) as gz:
+        gz.write(data)
+    return buffer.getvalue()
+
+
+#: Content encodings available to compress the Swagger specifications, by preference order
+SPECS_ENCODINGS = OrderedDict(
+    [('br', brotli.compress)] if brotli else []
+)
+SPECS_ENCODINGS['gzip'] = _gzip_compress
+
+
+class SerializedSchema(object):
+    '''
+    The Swagger specifications serialized once as JSON bytes.
+
+    :param dict schema: the specifications
+    :param dict settings: the JSON serialization settings
+    '''
+    def __init__(self, schema, settings):
+        self.schema = schema
+        self.settings = settings
+        # always end the json dumps with a new line (as output_json does)
+        self.data = (dumps(schema, **settings) + '\n').encode('utf-8')
+        self.etag = hashlib.sha1(self.data).hexdigest()
+        self._encoded = {}
+
+    def encode(self, encoding):
+        '''Get the specifications compressed with the given content encoding'''
+        if encoding not in self._encoded:
+            self._encoded[encoding] = SPECS_ENCODINGS[encoding](self.data)
+        return self._encoded[encoding]
+
+
 class SwaggerView(Resource):
-    '''Render the Swagger specifications as JSON'''
+    '''
+    Render the Swagger specifications as JSON
+
+    The specifications are serialized once and served with a content based ``ETag``
+    (the same for every process), so conditional requests get a ``304 Not Modified``.
+    Responses are also compressed when ``RESTPLUS_SWAGGER_COMPRESS`` is set.
+    '''
     def get(self):
         schema = self.api.__schema__
-        return schema, HTTPStatus.INTERNAL_SERVER_ERROR if 'error' in schema else HTTPStatus.OK
+        if 'error' in schema:
+            return schema, HTTPStatus.INTERNAL_SERVER_ERROR
+        return self.respond(self.serialize(schema))
+
+    def respond(self, serialized):
+        '''Build a conditional (and possibly compressed) response for some serialized specifications'''
+        compress = current_app.config.get('RESTPLUS_SWAGGER_COMPRESS', False)
+        encoding = None
+        if compress:
+            encoding = next((e for e in SPECS_ENCODINGS if request.accept_encodings[e]), None)
+
+        data = serialized.encode(encoding) if encoding else serialized.data
+        response = current_app.response_class(data, mimetype='application/json')
+        # Each encoding is a distinct representation so needs a distinct strong ETag
+        response.set_etag('-'.join((serialized.etag, encoding)) if encoding else serialized.etag)
+        if encoding:
+            response.content_encoding = encoding
+        if compress:
+            response.vary.add('Accept-Encoding')
+        return response.make_conditional(request)
+
+    def serialize(self, schema, key=None):
+        '''
+        Serialize some specifications, reusing the cached bytes while they are still matching.
+
+        :param dict schema: the specifications to serialize
+        :param key: the cache entry (``None`` for the full specifications, a namespace name otherwise)
+        :rtype: SerializedSchema
+        '''
+        settings = self.settings()
+        serialized = self.api._serialized_schemas.get(key)
+        if serialized is None or serialized.schema is not schema or serialized.settings != settings:
+            serialized = self.api._serialized_schemas[key] = SerializedSchema(schema, settings)
+        return serialized
+
+    def settings(self):
+        '''The JSON serialization settings'''
+        settings = dict(current_app.config.get('RESTPLUS_JSON', {}))
+        if current_app.debug:
+            settings.setdefault('indent', 4)
+        return settings
 
     def mediatypes(self):
         return ['application/json']
 
 
+class SwaggerNamespaceView(SwaggerView):
+    '''
+    Render the Swagger specifications of a single namespace as JSON
+
+    Only the namespace paths and the definitions they reference are included
+    so documentation clients can load large APIs one namespace at a time.
+    '''
+    def get(self, namespace):
+        schema = self.api.namespace_schema(namespace)
+        if schema is None:
+            raise NotFound()
+        if 'error' in schema:
+            return schema, HTTPStatus.INTERNAL_SERVER_ERROR
+        return self.respond(self.serialize(schema, namespace))
+
+
+class SwaggerIndexView(SwaggerView):
+    '''Render the index of the per-namespace Swagger specifications as JSON'''
+    def get(self):
+        # The index holds request dependent urls so it is not cached
+        return self.respond(SerializedSchema(self.api.specs_index, self.settings()))
+
+
 def mask_parse_error_handler(error):
     '''When a mask can't be parsed'''
     return {'message': 'Mask parse error: {0}'.format(error)}, HTTPStatus.BAD_REQUEST
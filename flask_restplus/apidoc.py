@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-from flask import url_for, Blueprint, render_template
+from flask import current_app, url_for, Blueprint, render_template
 
 
 class Apidoc(Blueprint):
@@ -32,5 +32,9 @@ def swagger_static(filename):
 
 def ui_for(api):
     '''Render a SwaggerUI for a given API'''
+    urls = None
+    if current_app.config.get('SWAGGER_UI_SPLIT_NAMESPACES', False):
+        # Let the UI load one namespace specifications at a time
+        urls = [{'name': ns['name'], 'url': ns['url']} for ns in api.specs_index['namespaces']]
     return render_template('swagger-ui.html', title=api.title,
-                           specs_url=api.specs_url)
+                           specs_url=api.specs_url, urls=urls)
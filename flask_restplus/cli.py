@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+'''
+Flask commands to export the APIs documentation at build time.
+'''
+from __future__ import unicode_literals, absolute_import
+
+import json
+
+import click
+
+from flask import current_app
+from flask.cli import AppGroup
+
+from .swagger import CHECKSUM_KEY, checksum
+
+
+cli = AppGroup('restplus', help='Flask-RESTPlus commands')
+
+
+def find_api(blueprint=None):
+    '''Find the API registered on the current application, by blueprint name if there are many'''
+    apis = current_app.extensions.get('restplus', {}).get('apis', [])
+    if blueprint:
+        apis = [api for api in apis if api.blueprint and api.blueprint.name == blueprint]
+    if not apis:
+        raise click.UsageError('No API found')
+    if len(apis) > 1:
+        raise click.UsageError('There are many APIs, choose one with --blueprint')
+    return apis[0]
+
+
+@cli.command('export')
+@click.argument('output', type=click.File('w'))
+@click.option('-b', '--blueprint', help='The API blueprint name (required if there are many APIs)')
+@click.option('--postman', is_flag=True, help='Export a Postman collection instead of the Swagger specifications')
+@click.option('--urlvars', is_flag=True, help='Include query strings placeholders in the Postman collection')
+@click.option('--swagger', is_flag=True, help='Include the swagger.json request in the Postman collection')
+def export(output, blueprint, postman, urlvars, swagger):
+    '''
+    Export the Swagger specifications (or a Postman collection) as JSON.
+
+    Exported specifications hold a checksum of the registered resources and models
+    so an API loading them (``specs_file``) can detect they are outdated.
+    Their ``basePath`` and ``host`` are fixed at export time from the application configuration.
+    '''
+    api = find_api(blueprint)
+    with current_app.test_request_context():
+        if postman:
+            data = api.as_postman(urlvars=urlvars, swagger=swagger)
+        else:
+            data = api.__schema__
+            if 'error' in data:
+                raise click.ClickException(data['error'])
+            data = dict(data)
+            data[CHECKSUM_KEY] = checksum(api)
+    json.dump(data, output, indent=2, sort_keys=True)
+    output.write('\n')
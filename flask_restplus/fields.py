@@ -6,21 +6,26 @@ import fnmatch
 import inspect
 import base64
 import binascii
+import copy
+import weakref
 
 from calendar import timegm
 from datetime import date, datetime
 from decimal import Decimal, ROUND_HALF_EVEN
 from email.utils import formatdate
+from functools import lru_cache
+from string import Formatter
 
 from six import iteritems, itervalues, text_type, string_types
 from six.moves.urllib.parse import urlparse, urlunparse
 
-from flask import url_for, request
-from werkzeug import cached_property
+from flask import url_for, request, _request_ctx_stack
+from werkzeug.datastructures import MultiDict
+from werkzeug.urls import url_quote
 
 from .inputs import date_from_iso8601, datetime_from_iso8601, datetime_from_rfc822, boolean
 from .errors import RestError
-from .marshalling import marshal
+from .marshalling import marshal, encode_bool, encode_float, encode_int, encode_text
 from .utils import camel_to_dash, not_none
 
 __all__ = ('Raw', 'String', 'FormattedString', 'Url', 'DateTime', 'Date',
@@ -40,10 +45,77 @@ class MarshallingError(RestError):
         super(MarshallingError, self).__init__(text_type(underlying_exception))
 
 
+RE_FORMAT_NAME = re.compile(r'[^.\[]*')
+
+
 def is_indexable_but_not_string(obj):
     return not hasattr(obj, "strip") and hasattr(obj, "__iter__")
 
 
+def _type_has(cls, name):
+    '''Whether a class instances have a given attribute (unlike ``hasattr(cls, name)``, ignore the metaclass)'''
+    return any(name in vars(klass) for klass in cls.__mro__)
+
+
+#: Values are looked up by item (``obj[key]``) before falling back on attributes
+_ITEM = 1
+#: Values are looked up by attribute only
+_ATTR = 2
+#: Lookup kind can't be determined from the type (dynamic attributes)
+_DYNAMIC = 3
+
+#: Cache the lookup kind by type (without keeping alive the types created at runtime)
+_KINDS = weakref.WeakKeyDictionary()
+
+
+def _lookup_kind(obj):
+    cls = type(obj)
+    kind = _KINDS.get(cls)
+    if kind is None:
+        if _type_has(cls, '__getattr__'):
+            kind = _DYNAMIC
+        else:
+            kind = _ITEM if not _type_has(cls, 'strip') and _type_has(cls, '__iter__') else _ATTR
+        _KINDS[cls] = kind
+    if kind is _DYNAMIC:
+        return _ITEM if is_indexable_but_not_string(obj) else _ATTR
+    return kind
+
+
+def _key_getter(key):
+    def getter(obj, default=None):
+        if _lookup_kind(obj) is _ITEM:
+            try:
+                return obj[key]
+            except (IndexError, TypeError, KeyError):
+                pass
+        return getattr(obj, key, default)
+    return getter
+
+
+@lru_cache(maxsize=4096)
+def accessor(key):
+    '''
+    Build a specialised getter for a given string key.
+
+    The key is parsed only once: dotted keys result in a chain of simple getters.
+    Getters are cached and have the signature ``getter(obj, default=None)``.
+
+    :param str key: the key (or dotted path) to the value
+    :rtype: callable
+    '''
+    keys = key.split('.')
+    if len(keys) == 1:
+        return _key_getter(key)
+    getters = tuple(_key_getter(k) for k in keys)
+
+    def getter(obj, default=None):
+        for get in getters:
+            obj = get(obj, default)
+        return obj
+    return getter
+
+
 def get_value(key, obj, default=None):
     '''Helper for pulling a keyed value off various types of objects'''
     if isinstance(key, int):
@@ -51,19 +123,11 @@ def get_value(key, obj, default=None):
     elif callable(key):
         return key(obj)
     else:
-        return _get_value_for_keys(key.split('.'), obj, default)
-
-
-def _get_value_for_keys(keys, obj, default):
-    if len(keys) == 1:
-        return _get_value_for_key(keys[0], obj, default)
-    else:
-        return _get_value_for_keys(
-            keys[1:], _get_value_for_key(keys[0], obj, default), default)
+        return accessor(key)(obj, default)
 
 
 def _get_value_for_key(key, obj, default):
-    if is_indexable_but_not_string(obj):
+    if _lookup_kind(obj) is _ITEM:
         try:
             return obj[key]
         except (IndexError, TypeError, KeyError):
@@ -88,6 +152,127 @@ def to_marshallable_type(obj):
     return dict(obj.__dict__)
 
 
+#: Format values are taken from ``obj.__marshallable__()``
+_MARSHALLABLE = 1
+#: Format values are taken from the object items
+_INDEXABLE = 2
+#: Format values are taken from the object instance attributes
+_INSTANCE = 3
+
+#: Cache the format values source by type (without keeping alive the types created at runtime)
+_SOURCES = weakref.WeakKeyDictionary()
+
+
+def _source_kind(obj):
+    cls = type(obj)
+    kind = _SOURCES.get(cls)
+    if kind is None:
+        if _type_has(cls, '__getattr__'):
+            # Dynamic attributes, the kind depends on the instance
+            return _source_kind_of(obj, hasattr)
+        kind = _SOURCES[cls] = _source_kind_of(cls, _type_has)
+    return kind
+
+
+def _source_kind_of(obj, has):
+    if has(obj, '__marshallable__'):
+        return _MARSHALLABLE
+    if has(obj, '__getitem__'):
+        return _INDEXABLE
+    return _INSTANCE
+
+
+def _format_names(src_str):
+    '''
+    Extract the top-level names a format string refers to.
+
+    :param str src_str: the format string (ie. ``'Hello {user.name}'``)
+    :returns: the names tuple (ie. ``('user',)``) or ``None``
+        if the string has positional (or invalid) replacement fields
+    :rtype: tuple
+    '''
+    names = set()
+    try:
+        for _, field_name, spec, _ in Formatter().parse(src_str):
+            if field_name is None:
+                continue
+            name = RE_FORMAT_NAME.match(field_name).group()
+            if not name or name.isdigit():
+                return None
+            names.add(name)
+            if spec and '{' in spec:
+                nested = _format_names(spec)
+                if nested is None:
+                    return None
+                names.update(nested)
+    except ValueError:
+        return None
+    return tuple(names)
+
+
+def _format_values(names, obj):
+    '''
+    Get the values of some format names from an object
+    without copying all its attributes (see :func:`to_marshallable_type`).
+
+    :param tuple names: the names as returned by :func:`_format_names`
+    :param obj: the object to get the values from
+    :rtype: dict
+    '''
+    kind = _source_kind(obj)
+    if kind is _MARSHALLABLE:
+        data = obj.__marshallable__()
+    elif kind is _INDEXABLE:
+        data = obj
+    else:
+        data = obj.__dict__
+    if not hasattr(data, 'keys'):
+        raise TypeError('format argument must be a mapping, not {0}'.format(type(data).__name__))
+    values = {}
+    for name in names:
+        if isinstance(data, dict) and name not in data:
+            raise KeyError(name)
+        values[name] = data[name]
+    return values
+
+
+#: The documentation and validation metadata given to the fields, by field
+_METADATA = weakref.WeakKeyDictionary()
+
+
+class Metadata(object):
+    '''
+    A field documentation or validation metadata.
+
+    Values are stored in a side table shared by all fields
+    and only materialised for the fields given some metadata.
+
+    :param str name: the metadata name
+    :param default: the value of the fields not given this metadata
+    '''
+    __slots__ = ('name', 'default')
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self.default = default
+
+    def __get__(self, field, cls=None):
+        if field is None:
+            return self.default
+        metadata = _METADATA.get(field)
+        return self.default if metadata is None else metadata.get(self.name, self.default)
+
+    def __set__(self, field, value):
+        _METADATA.setdefault(field, {})[self.name] = value
+
+
+def _set_metadata(field, **metadata):
+    '''Only store the given metadata on the field, the others fallback on their defaults'''
+    for name, value in iteritems(metadata):
+        if value is not None:
+            setattr(field, name, value)
+
+
 class Raw(object):
     '''
     Raw provides a base field class from which others should extend. It
@@ -106,7 +291,13 @@ class Raw(object):
     :param bool readonly: Is the field read only ? (for documentation purpose)
     :param example: An optional data example (for documentation purpose)
     :param callable mask: An optional mask function to be applied to output
+
+    Attributes used when marshalling (and the cached schema) are slotted.
+    Documentation and validation metadata are only stored in a shared side table when given
+    (see :class:`Metadata`), so built-in fields have no instance ``__dict__``.
     '''
+    __slots__ = ('attribute', 'default', 'mask', 'required', 'nullable', '_schema', '__weakref__')
+
     #: The JSON/Swagger schema type
     __schema_type__ = 'object'
     #: The JSON/Swagger schema format
@@ -114,17 +305,45 @@ class Raw(object):
     #: An optional JSON/Swagger schema example
     __schema_example__ = None
 
+    title = Metadata('title')
+    description = Metadata('description')
+    readonly = Metadata('readonly')
+    example = Metadata('example')
+
     def __init__(self, default=None, attribute=None, title=None, description=None,
                  required=None, readonly=None, example=None, mask=None, nullable=None, **kwargs):
         self.attribute = attribute
         self.default = default
-        self.title = title
-        self.description = description
         self.required = required
-        self.readonly = readonly
-        self.example = example or self.__schema_example__
         self.mask = mask
         self.nullable = nullable
+        self._schema = None
+        _set_metadata(self, title=title, description=description, readonly=readonly,
+                      example=example or self.__schema_example__)
+
+    def _attributes(self):
+        '''Get all the field attributes (slotted, metadata or not) as a dict'''
+        attributes = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name not in ('_schema', '__dict__', '__weakref__') and hasattr(self, name):
+                    attributes[name] = getattr(self, name)
+        attributes.update(_METADATA.get(self, {}))
+        attributes.update(getattr(self, '__dict__', {}))
+        return attributes
+
+    def _copy(self, copy_value):
+        field = object.__new__(type(self))
+        field._schema = None
+        for name, value in iteritems(self._attributes()):
+            setattr(field, name, copy_value(value))
+        return field
+
+    def __copy__(self):
+        return self._copy(lambda value: value)
+
+    def __deepcopy__(self, memo):
+        return self._copy(lambda value: copy.deepcopy(value, memo))
 
     def format(self, value):
         '''
@@ -143,7 +362,7 @@ class Raw(object):
         '''
         return value
 
-    def output(self, key, obj, **kwargs):
+    def output(self, key, obj, mask=None, **kwargs):
         '''
         Pulls the value for the given key from the object, applies the
         field's formatting and returns the result. If the key is not found
@@ -151,6 +370,7 @@ class Raw(object):
         values which do not require the existence of the key in the object
         should override this and return the desired value.
 
+        :param Mask mask: An optional mask overriding the field one
         :raises MarshallingError: In case of formatting problem
         '''
 
@@ -165,16 +385,20 @@ class Raw(object):
         except MarshallingError as e:
             msg = 'Unable to marshal field "{0}" value "{1}": {2}'.format(key, value, str(e))
             raise MarshallingError(msg)
-        return self.mask.apply(data) if self.mask else data
+        mask = mask or self.mask
+        return mask.apply(data) if mask else data
 
     def _v(self, key):
         '''Helper for getting a value from attribute allowing callable'''
         value = getattr(self, key)
         return value() if callable(value) else value
 
-    @cached_property
+    @property
     def __schema__(self):
-        return not_none(self.schema())
+        schema = self._schema
+        if schema is None:
+            schema = self._schema = not_none(self.schema())
+        return schema
 
     def schema(self):
         return {
@@ -205,6 +429,7 @@ class Nested(Raw):
         null)
     '''
     __schema_type__ = None
+    __slots__ = ('model', 'as_list', 'allow_null', 'skip_none')
 
     def __init__(self, model, allow_null=False, skip_none=False, as_list=False, **kwargs):
         self.model = model
@@ -217,7 +442,7 @@ class Nested(Raw):
     def nested(self):
         return getattr(self.model, 'resolved', self.model)
 
-    def output(self, key, obj, ordered=False, **kwargs):
+    def output(self, key, obj, ordered=False, mask=None, **kwargs):
         value = get_value(key if self.attribute is None else self.attribute, obj)
         if value is None:
             if self.allow_null:
@@ -225,7 +450,7 @@ class Nested(Raw):
             elif self.default is not None:
                 return self.default
 
-        return marshal(value, self.nested, skip_none=self.skip_none, ordered=ordered)
+        return marshal(value, self.nested, skip_none=self.skip_none, mask=mask, ordered=ordered)
 
     def schema(self):
         schema = super(Nested, self).schema()
@@ -244,7 +469,7 @@ class Nested(Raw):
         return schema
 
     def clone(self, mask=None):
-        kwargs = self.__dict__.copy()
+        kwargs = self._attributes()
         model = kwargs.pop('model')
         if mask:
             model = mask.apply(model.resolved if hasattr(model, 'resolved') else model)
@@ -259,12 +484,16 @@ class List(Raw):
 
     :param cls_or_instance: The field type the list will contain.
     '''
+    __slots__ = ('container', )
+
+    min_items = Metadata('min_items')
+    max_items = Metadata('max_items')
+    unique = Metadata('unique')
 
     def __init__(self, cls_or_instance, **kwargs):
-        self.min_items = kwargs.pop('min_items', None)
-        self.max_items = kwargs.pop('max_items', None)
-        self.unique = kwargs.pop('unique', None)
+        min_items, max_items, unique = (kwargs.pop(k, None) for k in ('min_items', 'max_items', 'unique'))
         super(List, self).__init__(**kwargs)
+        _set_metadata(self, min_items=min_items, max_items=max_items, unique=unique)
         error_msg = 'The type of the list elements must be a subclass of fields.Raw'
         if isinstance(cls_or_instance, type):
             if not issubclass(cls_or_instance, Raw):
@@ -276,31 +505,67 @@ class List(Raw):
             self.container = cls_or_instance
 
     def format(self, value):
+        return self._format(value)
+
+    def _format(self, value, mask=None):
         # Convert all instances in typed list to container type
         if isinstance(value, set):
             value = list(value)
+        elif not isinstance(value, (list, tuple)):
+            # array.array and NumPy arrays convert themselves to native Python values
+            value = value.tolist() if hasattr(value, 'tolist') else list(value)
 
-        is_nested = isinstance(self.container, Nested) or type(self.container) is Raw
+        container = self.container
+        if type(container).output is Raw.output and container.attribute is None and not (mask or container.mask):
+            # The items only need to be formatted, no need to dispatch them through output
+            formatted = self._format_items(value)
+            if formatted is not None:
+                return formatted
 
-        def is_attr(val):
-            return self.container.attribute and hasattr(val, self.container.attribute)
+        is_nested = isinstance(container, Nested) or type(container) is Raw
+        attribute = container.attribute
 
-        return [
-            self.container.output(idx,
-                                  val if (isinstance(val, dict) or is_attr(val)) and not is_nested else value)
-            for idx, val in enumerate(value)
-        ]
+        def is_item(val):
+            return not is_nested and (isinstance(val, dict) or (attribute and hasattr(val, attribute)))
+
+        kwargs = {'mask': mask} if mask else {}
+        return [container.output(idx, val if is_item(val) else value, **kwargs) for idx, val in enumerate(value)]
+
+    def _format_items(self, values):
+        '''
+        Format all the items at once (equivalent to calling output on each item).
 
-    def output(self, key, data, ordered=False, **kwargs):
+        :returns: the formatted items or ``None`` if they need to go through output
+        '''
+        container = self.container
+        convert = _BULK_CONVERTERS.get(type(container))
+        try:
+            if convert is not None and None not in values:
+                return list(map(convert, values))
+            formatted = []
+            for val in values:
+                if isinstance(val, dict):
+                    return None
+                elif val is None:
+                    default = container._v('default')
+                    formatted.append(container.format(default) if default else default)
+                else:
+                    formatted.append(container.format(val))
+            return formatted
+        except (MarshallingError, ValueError, TypeError):
+            # Let output report the failing item
+            return None
+
+    def output(self, key, data, ordered=False, mask=None, **kwargs):
         value = get_value(key if self.attribute is None else self.attribute, data)
         # we cannot really test for external dict behavior
         if is_indexable_but_not_string(value) and not isinstance(value, dict):
-            return self.format(value)
+            return self._format(value, mask) if mask else self.format(value)
 
         if value is None:
             return self._v('default')
 
-        return [marshal(value, self.container.nested)]
+        return [marshal(value, self.container.nested, mask=mask)]
 
     def schema(self):
         schema = super(List, self).schema()
@@ -312,7 +577,7 @@ class List(Raw):
         return schema
 
     def clone(self, mask=None):
-        kwargs = self.__dict__.copy()
+        kwargs = self._attributes()
         model = kwargs.pop('container')
         if mask:
             model = mask.apply(model)
@@ -320,13 +585,17 @@ class List(Raw):
 
 
 class StringMixin(object):
+    __slots__ = ()
     __schema_type__ = 'string'
 
+    min_length = Metadata('min_length')
+    max_length = Metadata('max_length')
+    pattern = Metadata('pattern')
+
     def __init__(self, *args, **kwargs):
-        self.min_length = kwargs.pop('min_length', None)
-        self.max_length = kwargs.pop('max_length', None)
-        self.pattern = kwargs.pop('pattern', None)
+        min_length, max_length, pattern = (kwargs.pop(k, None) for k in ('min_length', 'max_length', 'pattern'))
         super(StringMixin, self).__init__(*args, **kwargs)
+        _set_metadata(self, min_length=min_length, max_length=max_length, pattern=pattern)
 
     def schema(self):
         schema = super(StringMixin, self).schema()
@@ -337,12 +606,19 @@ class StringMixin(object):
 
 
 class MinMaxMixin(object):
+    __slots__ = ()
+    minimum = Metadata('minimum')
+    exclusiveMinimum = Metadata('exclusiveMinimum')
+    maximum = Metadata('maximum')
+    exclusiveMaximum = Metadata('exclusiveMaximum')
+
     def __init__(self, *args, **kwargs):
-        self.minimum = kwargs.pop('min', None)
-        self.exclusiveMinimum = kwargs.pop('exclusiveMin', None)
-        self.maximum = kwargs.pop('max', None)
-        self.exclusiveMaximum = kwargs.pop('exclusiveMax', None)
+        minimum, exclusive_minimum, maximum, exclusive_maximum = (
+            kwargs.pop(k, None) for k in ('min', 'exclusiveMin', 'max', 'exclusiveMax')
+        )
         super(MinMaxMixin, self).__init__(*args, **kwargs)
+        _set_metadata(self, minimum=minimum, exclusiveMinimum=exclusive_minimum,
+                      maximum=maximum, exclusiveMaximum=exclusive_maximum)
 
     def schema(self):
         schema = super(MinMaxMixin, self).schema()
@@ -354,11 +630,15 @@ class MinMaxMixin(object):
 
 
 class NumberMixin(MinMaxMixin):
+    __slots__ = ()
     __schema_type__ = 'number'
 
+    multiple = Metadata('multiple')
+
     def __init__(self, *args, **kwargs):
-        self.multiple = kwargs.pop('multiple', None)
+        multiple = kwargs.pop('multiple', None)
         super(NumberMixin, self).__init__(*args, **kwargs)
+        _set_metadata(self, multiple=multiple)
 
     def schema(self):
         schema = super(NumberMixin, self).schema()
@@ -372,11 +652,16 @@ class String(StringMixin, Raw):
     be converted to :class:`unicode` in python2 and :class:`str` in
     python3.
     '''
+    __slots__ = ()
+
+    enum = Metadata('enum')
+    discriminator = Metadata('discriminator')
 
     def __init__(self, *args, **kwargs):
-        self.enum = kwargs.pop('enum', None)
-        self.discriminator = kwargs.pop('discriminator', None)
+        enum = kwargs.pop('enum', None)
+        discriminator = kwargs.pop('discriminator', None)
         super(String, self).__init__(*args, **kwargs)
+        _set_metadata(self, enum=enum, discriminator=discriminator)
         self.required = self.discriminator or self.required
 
     def format(self, value):
@@ -401,6 +686,7 @@ class Integer(NumberMixin, Raw):
 
     :param int default: The default value for the field, if no value is specified.
     '''
+    __slots__ = ()
     __schema_type__ = 'integer'
 
     def format(self, value):
@@ -418,6 +704,7 @@ class Float(NumberMixin, Raw):
 
     ex : 3.141592653589793 3.1415926535897933e-06 3.141592653589793e+24 nan inf -inf
     '''
+    __slots__ = ()
 
     def format(self, value):
         try:
@@ -426,12 +713,20 @@ class Float(NumberMixin, Raw):
             raise MarshallingError(ve)
 
 
+#: Conversions equivalent to formatting each item of a list
+_BULK_CONVERTERS = {
+    Integer: int,
+    Float: float,
+}
+
+
 class Arbitrary(NumberMixin, Raw):
     '''
     A floating point number with an arbitrary precision.
 
     ex: 634271127864378216478362784632784678324.23432
     '''
+    __slots__ = ()
 
     def format(self, value):
         return text_type(Decimal(value))
@@ -444,6 +739,7 @@ class Fixed(NumberMixin, Raw):
     '''
     A decimal number with a fixed precision.
     '''
+    __slots__ = ('precision', )
 
     def __init__(self, decimals=5, **kwargs):
         super(Fixed, self).__init__(**kwargs)
@@ -462,6 +758,7 @@ class Boolean(Raw):
 
     Empty collections such as ``""``, ``{}``, ``[]``, etc. will be converted to ``False``.
     '''
+    __slots__ = ()
     __schema_type__ = 'boolean'
 
     def format(self, value):
@@ -480,6 +777,7 @@ class DateTime(MinMaxMixin, Raw):
     '''
     __schema_type__ = 'string'
     __schema_format__ = 'date-time'
+    __slots__ = ('dt_format', )
 
     def __init__(self, dt_format='iso8601', **kwargs):
         super(DateTime, self).__init__(**kwargs)
@@ -548,6 +846,7 @@ class Date(DateTime):
 
     See :meth:`datetime.date.isoformat` for more info on the ISO 8601 format.
     '''
+    __slots__ = ()
     __schema_format__ = 'date'
 
     def __init__(self, **kwargs):
@@ -567,14 +866,68 @@ class Date(DateTime):
             raise ValueError('Unsupported Date format')
 
 
+#: The ``url_for`` keyword arguments which are not rule values
+URL_FOR_OPTIONS = frozenset(('_external', '_anchor', '_method', '_scheme'))
+
+#: Compiled url templates by rule id (the rule is kept along so its id can't be reused)
+_url_templates = {}
+
+
+def url_template(rule):
+    '''
+    Compile a routing rule into an url template.
+
+    The template is a ``(domain, parts)`` tuple where parts are either
+    already quoted static strings or ``(name, converter)`` tuples for the rule variables.
+    Templates are cached by rule.
+
+    :param werkzeug.routing.Rule rule: the rule to compile
+    :returns: the template or ``None`` if the rule can only be built by werkzeug
+    '''
+    cached = _url_templates.get(id(rule))
+    if cached is None:
+        cached = _url_templates[id(rule)] = (rule, _compile_url_template(rule))
+    return cached[1]
+
+
+def _compile_url_template(rule):
+    trace = getattr(rule, '_trace', None)
+    converters = getattr(rule, '_converters', None)
+    if not trace or converters is None or rule.defaults or rule.map.host_matching:
+        return None
+    domain, parts = '', None
+    for is_dynamic, data in trace:
+        if parts is None:
+            if is_dynamic:
+                return None
+            elif data == '|':
+                parts = []
+            else:
+                domain += data
+        elif is_dynamic:
+            parts.append((data, converters[data]))
+        else:
+            static = url_quote(data, charset=rule.map.charset, safe='/:|+')
+            if parts and isinstance(parts[-1], string_types):
+                parts[-1] += static
+            else:
+                parts.append(static)
+    return domain, tuple(parts)
+
+
 class Url(StringMixin, Raw):
     '''
     A string representation of a Url
 
+    Urls are built from a template compiled once per rule
+    and fall back on :func:`~flask.url_for` whenever the template can't be used
+    (ie. rules with defaults or many rules for the endpoint, url defaults functions...).
+
     :param str endpoint: Endpoint name. If endpoint is ``None``, ``request.endpoint`` is used instead
     :param bool absolute: If ``True``, ensures that the generated urls will have the hostname included
     :param str scheme: URL scheme specifier (e.g. ``http``, ``https``)
     '''
+    __slots__ = ('endpoint', 'absolute', 'scheme')
 
     def __init__(self, endpoint=None, absolute=False, scheme=None, **kwargs):
         super(Url, self).__init__(**kwargs)
@@ -586,6 +939,9 @@ class Url(StringMixin, Raw):
         try:
             data = to_marshallable_type(obj)
             endpoint = self.endpoint if self.endpoint is not None else request.endpoint
+            url = self.from_template(endpoint, data)
+            if url is not None:
+                return url
             o = urlparse(url_for(endpoint, _external=self.absolute, **data))
             if self.absolute:
                 scheme = self.scheme if self.scheme is not None else o.scheme
@@ -594,6 +950,48 @@ class Url(StringMixin, Raw):
         except TypeError as te:
             raise MarshallingError(te)
 
+    def from_template(self, endpoint, data):
+        '''
+        Build the url from the endpoint rule template.
+
+        :returns: the url or ``None`` if it can't be built without :func:`~flask.url_for`
+        '''
+        reqctx = _request_ctx_stack.top
+        if reqctx is None or reqctx.url_adapter is None or reqctx.app.url_default_functions:
+            return None
+        if not isinstance(data, dict) or isinstance(data, MultiDict) or not URL_FOR_OPTIONS.isdisjoint(data):
+            return None
+        if endpoint[:1] == '.':
+            return None  # Blueprint relative endpoint
+        adapter = reqctx.url_adapter
+        rules = adapter.map._rules_by_endpoint.get(endpoint)
+        if not rules or len(rules) != 1:
+            return None
+        template = url_template(rules[0])
+        if template is None:
+            return None
+        domain, parts = template
+        path = []
+        try:
+            for part in parts:
+                if isinstance(part, string_types):
+                    path.append(part)
+                    continue
+                name, converter = part
+                value = data.get(name)
+                if value is None:
+                    return None
+                path.append(converter.to_url(value))
+        except Exception:
+            # Let werkzeug handle (and report) invalid values
+            return None
+        path = ''.join(path)
+        path = '{0}/{1}'.format(adapter.script_name.rstrip('/'), path.lstrip('/'))
+        if self.absolute:
+            scheme = self.scheme if self.scheme is not None else adapter.url_scheme
+            return '{0}://{1}{2}'.format(scheme, adapter.get_host(domain), path)
+        return path
+
 
 class FormattedString(StringMixin, Raw):
     '''
@@ -615,15 +1013,19 @@ class FormattedString(StringMixin, Raw):
 
     :param str src_str: the string to format with the other values from the response.
     '''
+    __slots__ = ('src_str', '_names')
 
     def __init__(self, src_str, **kwargs):
         super(FormattedString, self).__init__(**kwargs)
         self.src_str = text_type(src_str)
+        self._names = _format_names(self.src_str)
 
     def output(self, key, obj, **kwargs):
         try:
-            data = to_marshallable_type(obj)
-            return self.src_str.format(**data)
+            if obj is None or self._names is None:
+                data = to_marshallable_type(obj)
+                return self.src_str.format(**data)
+            return self.src_str.format(**_format_values(self._names, obj))
         except (TypeError, IndexError) as error:
             raise MarshallingError(error)
 
@@ -634,16 +1036,22 @@ class ClassName(String):
 
     :param bool dash: If `True`, transform CamelCase to kebab_case.
     '''
+    __slots__ = ('dash', )
 
     def __init__(self, dash=False, **kwargs):
         super(ClassName, self).__init__(**kwargs)
         self.dash = dash
 
     def output(self, key, obj, **kwargs):
-        classname = obj.__class__.__name__
-        if classname == 'dict':
-            return 'object'
-        return camel_to_dash(classname) if self.dash else classname
+        return _class_name(obj.__class__, self.dash)
+
+
+@lru_cache(maxsize=1024)
+def _class_name(cls, dash):
+    classname = cls.__name__
+    if classname == 'dict':
+        return 'object'
+    return camel_to_dash(classname) if dash else classname
 
 
 class Polymorph(Nested):
@@ -665,13 +1073,16 @@ class Polymorph(Nested):
 
     :param dict mapping: Maps classes to their model/fields representation
     '''
+    __slots__ = ('mapping', '_models_by_class')
 
     def __init__(self, mapping, required=False, **kwargs):
         self.mapping = mapping
         parent = self.resolve_ancestor(list(itervalues(mapping)))
         super(Polymorph, self).__init__(parent, allow_null=not required, **kwargs)
+        # Models are only ever added for a given class so concurrent lookups are safe
+        self._models_by_class = {}
 
-    def output(self, key, obj, ordered=False, **kwargs):
+    def output(self, key, obj, ordered=False, mask=None, **kwargs):
         # Copied from upstream NestedField
         value = get_value(key if self.attribute is None else self.attribute, obj)
         if value is None:
@@ -684,14 +1095,26 @@ class Polymorph(Nested):
         if not hasattr(value, '__class__'):
             raise ValueError('Polymorph field only accept class instances')
 
-        candidates = [fields for cls, fields in iteritems(self.mapping) if isinstance(value, cls)]
+        return marshal(value, self.model_for(value.__class__), mask=mask or self.mask, ordered=ordered)
 
-        if len(candidates) <= 0:
-            raise ValueError('Unknown class: ' + value.__class__.__name__)
-        elif len(candidates) > 1:
-            raise ValueError('Unable to determine a candidate for: ' + value.__class__.__name__)
-        else:
-            return marshal(value, candidates[0].resolved, mask=self.mask, ordered=ordered)
+    def model_for(self, cls):
+        '''
+        Get the model mapped to a given class.
+
+        The mapping is only scanned once per class, the resulting model is cached.
+
+        :param type cls: the class of the object to marshal
+        :raises ValueError: if there is no model or many models mapped to this class
+        '''
+        model = self._models_by_class.get(cls)
+        if model is None:
+            candidates = [fields for klass, fields in iteritems(self.mapping) if issubclass(cls, klass)]
+            if len(candidates) <= 0:
+                raise ValueError('Unknown class: ' + cls.__name__)
+            elif len(candidates) > 1:
+                raise ValueError('Unable to determine a candidate for: ' + cls.__name__)
+            model = self._models_by_class[cls] = candidates[0]
+        return model
 
     def resolve_ancestor(self, models):
         '''
@@ -709,9 +1132,9 @@ class Polymorph(Nested):
         return models[0].get_parent(parent_name)
 
     def clone(self, mask=None):
-        data = self.__dict__.copy()
+        data = self._attributes()
         mapping = data.pop('mapping')
-        for field in ('allow_null', 'model'):
+        for field in ('allow_null', 'model', '_models_by_class'):
             data.pop(field, None)
 
         data['mask'] = mask
@@ -719,6 +1142,7 @@ class Polymorph(Nested):
 
 
 class Base64(StringMixin, Raw):
+    __slots__ = ()
     __schema_format__ = 'base64'
     __schema_example__ = base64.b64encode(b'string').decode()
 
@@ -739,18 +1163,39 @@ class Base64(StringMixin, Raw):
         return self.parse(value).decode()
 
 
+#: JSON encoders for the values output by each field type (see :func:`~flask_restplus.marshal_json`)
+_JSON_ENCODERS = {
+    String: encode_text,
+    Integer: encode_int,
+    Float: encode_float,
+    Arbitrary: encode_text,
+    Fixed: encode_text,
+    Boolean: encode_bool,
+    DateTime: encode_text,
+    Date: encode_text,
+    Url: encode_text,
+    FormattedString: encode_text,
+    ClassName: encode_text,
+    Base64: encode_text,
+}
+
+
+@lru_cache(maxsize=256)
+def _glob(pattern):
+    '''Compile a (case insensitive) glob pattern to a matching function'''
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE).match
+
+
 class Wildcard(Raw):
     '''
     Field for marshalling list of "unkown" fields.
 
+    The field key is a glob matched against the object keys (or attributes).
+    The field holds no marshalling state so it can be shared between models and threads.
+
     :param cls_or_instance: The field type the list will contain.
     '''
-    exclude = set()
-    # cache the flat object
-    _flat = None
-    _obj = None
-    _cache = set()
-    _last = None
+    __slots__ = ('container', )
 
     def __init__(self, cls_or_instance, **kwargs):
         super(Wildcard, self).__init__(**kwargs)
@@ -766,66 +1211,48 @@ class Wildcard(Raw):
 
     def _flatten(self, obj):
         if obj is None:
-            return None
-        if obj == self._obj and self._flat is not None:
-            return self._flat
+            return []
         if isinstance(obj, dict):
-            self._flat = [x for x in iteritems(obj)]
-        else:
-
-            def __match_attributes(attribute):
-                attr_name, attr_obj = attribute
-                if inspect.isroutine(attr_obj) or \
-                        (attr_name.startswith('__') and attr_name.endswith('__')):
-                    return False
-                return True
-
-            attributes = inspect.getmembers(obj)
-            self._flat = [x for x in attributes if __match_attributes(x)]
-
-        self._cache = set()
-        self._obj = obj
-        return self._flat
+            return list(iteritems(obj))
 
-    @property
-    def key(self):
-        return self._last
-
-    def reset(self):
-        self.exclude = set()
-        self._flat = None
-        self._obj = None
-        self._cache = set()
-        self._last = None
+        def __match_attributes(attribute):
+            attr_name, attr_obj = attribute
+            if inspect.isroutine(attr_obj) or \
+                    (attr_name.startswith('__') and attr_name.endswith('__')):
+                return False
+            return True
 
-    def output(self, key, obj, ordered=False):
-        value = None
-        reg = fnmatch.translate(key)
-
-        if self._flatten(obj):
-            while True:
-                try:
-                    # we are using pop() so that we don't
-                    # loop over the whole object every time dropping the
-                    # complexity to O(n)
-                    (objkey, val) = self._flat.pop()
-                    if objkey not in self._cache and \
-                            objkey not in self.exclude and \
-                            re.match(reg, objkey, re.IGNORECASE):
-                        value = val
-                        self._cache.add(objkey)
-                        self._last = objkey
-                        break
-                except IndexError:
-                    break
+        return [x for x in inspect.getmembers(obj) if __match_attributes(x)]
 
+    def _format(self, value):
         if value is None:
             if self.default is not None:
                 return self.container.format(self.default)
             return None
-
         return self.container.format(value)
 
+    def items(self, key, obj, exclude=()):
+        '''
+        Marshal all the object items matching the glob in a single pass.
+
+        :param str key: the glob pattern (ie. ``*`` or ``j*``)
+        :param obj: the object (a ``dict`` or any object with attributes)
+        :param exclude: the keys already marshalled by other fields
+        :returns: the matching ``(key, value)`` pairs or ``[(key, default)]`` if nothing matches
+        :rtype: list
+        '''
+        match = _glob(key)
+        # Items are emitted from the last one (as with the former stateful implementation)
+        items = [
+            (objkey, self._format(value))
+            for objkey, value in reversed(self._flatten(obj))
+            if objkey not in exclude and match(objkey)
+        ]
+        return items or [(key, self._format(None))]
+
+    def output(self, key, obj, ordered=False):
+        return self.items(key, obj)[0][1]
+
     def schema(self):
         schema = super(Wildcard, self).schema()
         schema['type'] = 'object'
@@ -833,6 +1260,6 @@ class Wildcard(Raw):
         return schema
 
     def clone(self):
-        kwargs = self.__dict__.copy()
+        kwargs = self._attributes()
         model = kwargs.pop('container')
         return self.__class__(model, **kwargs)
@@ -1,13 +1,17 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import json
+import math
+
 from collections import OrderedDict
-from functools import wraps
-from six import iteritems
+from functools import partial, wraps
+from json.encoder import encode_basestring_ascii
+from six import iteritems, string_types, text_type
 
 from flask import request, current_app, has_app_context
 
-from .mask import Mask, apply as apply_mask
+from .mask import Mask, MaskedView, cache as mask_cache
 from .utils import unpack
 
 
@@ -61,41 +65,26 @@ def marshal(data, fields, envelope=None, skip_none=False, mask=None, ordered=Fal
         # ugly local import to avoid dependency loop
         from .fields import Wildcard
 
+        # The compiled plan is cached and its outputs are bound to the sub-masks
+        fields, plan = _compile(fields, mask)
+
         items = []
-        keys = []
-        for dkey, val in fields.items():
+        # keys already marshalled are excluded from the wildcards
+        keys = set()
+        for (dkey, output, nested), field in zip(plan.entries, plan.fields):
             key = dkey
-            if isinstance(val, dict):
-                value = marshal(data, val, skip_none=skip_none, ordered=ordered)
+            if nested is not None:
+                value = marshal(data, nested, skip_none=skip_none, ordered=ordered)
+            elif isinstance(field, Wildcard):
+                for key, value in field.items(dkey, data, exclude=keys):
+                    if skip_none and (value is None or value == OrderedDict() or value == {}):
+                        continue
+                    items.append((key, value))
+                continue
             else:
-                field = make(val)
-                is_wildcard = isinstance(field, Wildcard)
-                # exclude already parsed keys from the wildcard
-                if is_wildcard:
-                    field.reset()
-                    if keys:
-                        field.exclude |= set(keys)
-                        keys = []
-                value = field.output(dkey, data)
-                if is_wildcard:
-
-                    def _append(k, v):
-                        if skip_none and (v is None or v == OrderedDict() or v == {}):
-                            return
-                        items.append((k, v))
-
-                    key = field.key or dkey
-                    _append(key, value)
-                    while True:
-                        value = field.output(dkey, data, ordered=ordered)
-                        if value is None or \
-                                value == field.container.format(field.default):
-                            break
-                        key = field.key
-                        _append(key, value)
-                    continue
-
-            keys.append(key)
+                value = output(dkey, data)
+
+            keys.add(key)
             if skip_none and (value is None or value == OrderedDict() or value == {}):
                 continue
             items.append((key, value))
@@ -150,46 +139,448 @@ def _marshal(data, fields, envelope=None, skip_none=False, mask=None, ordered=Fa
     OrderedDict([('a', 100)])
 
     """
-    # ugly local import to avoid dependency loop
-    from .fields import Wildcard
-
-    mask = mask or getattr(fields, '__mask__', None)
-    fields = getattr(fields, 'resolved', fields)
-    if mask:
-        fields = apply_mask(fields, mask, skip=True)
+    fields, plan = _compile(fields, mask)
 
     if isinstance(data, (list, tuple)):
-        out = [marshal(d, fields, skip_none=skip_none, ordered=ordered) for d in data]
+        out = _marshal_rows(data, fields, plan, skip_none, ordered)
         if envelope:
             out = OrderedDict([(envelope, out)]) if ordered else {envelope: out}
         return out, False
 
-    has_wildcards = {'present': False}
+    if plan.has_wildcards:
+        # Wildcards are handled by `marshal` on the whole fields set
+        return None, True
+
+    out = plan.marshal(data, skip_none=skip_none, ordered=ordered)
+
+    if envelope:
+        out = OrderedDict([(envelope, out)]) if ordered else {envelope: out}
+
+    return out, False
+
+
+def marshal_many(data, fields, envelope=None, skip_none=False, mask=None, ordered=False):
+    """Marshal a collection of objects with the same fields.
+
+    Fields are resolved, masked and compiled once for the whole collection
+    which is then processed in a single loop.
+
+    The collection can also be given column-oriented,
+    as a mapping of sequences (ie. a ``dict`` of lists or a pandas ``DataFrame``).
+
+    :param data: an iterable of objects or a mapping of columns
+    :param fields: a dict of whose keys will make up the final serialized
+                   response output
+    :param envelope: optional key that will be used to envelop the serialized
+                     response
+    :param bool skip_none: optional key will be used to eliminate fields
+                           which value is None or the field's key not
+                           exist in data
+    :param bool ordered: Wether or not to preserve order
+
 
-    def __format_field(key, val):
-        field = make(val)
-        if isinstance(field, Wildcard):
-            has_wildcards['present'] = True
-        value = field.output(key, data, ordered=ordered)
-        return (key, value)
+    >>> from flask_restplus import fields, marshal_many
+    >>> mfields = { 'a': fields.Raw }
 
-    items = (
-        (k, marshal(data, v, skip_none=skip_none, ordered=ordered))
-        if isinstance(v, dict)
-        else __format_field(k, v)
-        for k, v in iteritems(fields)
-    )
+    >>> marshal_many([{'a': 1}, {'a': 2}], mfields)
+    [{'a': 1}, {'a': 2}]
 
-    if skip_none:
-        items = ((k, v) for k, v in items
-                 if v is not None and v != OrderedDict() and v != {})
+    >>> marshal_many({'a': [1, 2], 'b': ['x', 'y']}, mfields)
+    [{'a': 1}, {'a': 2}]
 
-    out = OrderedDict(items) if ordered else dict(items)
+    """
+    fields, plan = _compile(fields, mask)
+
+    if hasattr(data, 'items'):
+        data = _columns_to_rows(data)
+
+    out = _marshal_rows(data, fields, plan, skip_none, ordered)
 
     if envelope:
         out = OrderedDict([(envelope, out)]) if ordered else {envelope: out}
 
-    return out, has_wildcards['present']
+    return out
+
+
+def marshal_iter(data, fields, skip_none=False, mask=None, ordered=False):
+    """Lazily marshal an iterable of objects with the same fields.
+
+    Fields are resolved, masked and compiled immediately
+    (so mask errors are raised on call) but objects are only
+    consumed and marshalled on iteration.
+
+    :param data: an iterable of objects (ie. a generator or a database cursor)
+    :param fields: a dict of whose keys will make up the final serialized
+                   response output
+    :param bool skip_none: optional key will be used to eliminate fields
+                           which value is None or the field's key not
+                           exist in data
+    :param bool ordered: Wether or not to preserve order
+    :rtype: generator
+    """
+    fields, plan = _compile(fields, mask)
+
+    def generate():
+        for row in data:
+            if plan.has_wildcards:
+                yield marshal(row, fields, skip_none=skip_none, ordered=ordered)
+            elif isinstance(row, (list, tuple)):
+                yield _marshal_rows(row, fields, plan, skip_none, ordered)
+            else:
+                yield plan.marshal(row, skip_none=skip_none, ordered=ordered)
+    return generate()
+
+
+def _compile(fields, mask=None):
+    """Resolve and mask the fields and get their marshalling plan"""
+    mask = mask or getattr(fields, '__mask__', None)
+    resolved = getattr(fields, 'resolved', None)
+    if resolved is not None:
+        fields = resolved
+    if mask:
+        # Masked views are cached and hold their own plan
+        fields = mask_cache.get(fields, mask, MaskedView)
+        return fields, plan_for(fields)
+    # Only resolved models (and masked views) are safe to cache a plan on:
+    # they are private copies which are never mutated afterward.
+    cacheable = resolved is not None or isinstance(fields, MaskedView)
+    return fields, plan_for(fields) if cacheable else Plan(fields)
+
+
+def _marshal_rows(rows, fields, plan, skip_none, ordered):
+    """Marshal each row of a collection given an already compiled plan"""
+    if plan.has_wildcards:
+        return [marshal(row, fields, skip_none=skip_none, ordered=ordered) for row in rows]
+
+    marshal_row = plan.marshal
+    return [
+        _marshal_rows(row, fields, plan, skip_none, ordered)
+        if isinstance(row, (list, tuple))
+        else marshal_row(row, skip_none=skip_none, ordered=ordered)
+        for row in rows
+    ]
+
+
+def _columns_to_rows(columns):
+    """Iterate over a mapping of columns as rows dicts"""
+    keys, values = [], []
+    for key, column in columns.items():
+        keys.append(key)
+        values.append(column)
+    for row in zip(*values):
+        yield dict(zip(keys, row))
+
+
+class Plan(object):
+    """A precompiled marshalling plan for a given fields dict.
+
+    Fields are instanciated and inspected once so marshalling an object
+    is a single loop over a flat tuple of ``(key, output, nested)`` entries
+    where ``output`` is the bound field ``output`` method
+    and ``nested`` a raw nested fields dict (``output`` is then ``None``).
+
+    Compiling a :class:`~flask_restplus.mask.MaskedView` binds its sub-masks
+    to the ``output`` methods of the original fields.
+
+    The JSON encoders used by :meth:`encode` are only compiled on first use.
+
+    :param dict fields: the (resolved) fields dict or masked view to compile
+    """
+    __slots__ = ('entries', 'fields', 'masks', 'has_wildcards', 'encoders')
+
+    def __init__(self, fields):
+        # ugly local import to avoid dependency loop
+        from .fields import Wildcard
+
+        masks = getattr(fields, 'masks', {})
+        entries = []
+        instances = []
+        has_wildcards = False
+        for key, value in iteritems(fields):
+            if isinstance(value, (dict, MaskedView)):
+                entries.append((key, None, value))
+                instances.append(None)
+            else:
+                field = make(value)
+                has_wildcards = has_wildcards or isinstance(field, Wildcard)
+                output = field.output
+                if key in masks:
+                    output = partial(output, mask=masks[key])
+                entries.append((key, output, None))
+                instances.append(field)
+        self.entries = tuple(entries)
+        self.fields = tuple(instances)
+        self.masks = masks
+        self.has_wildcards = has_wildcards
+        self.encoders = None
+
+    def marshal(self, data, skip_none=False, ordered=False):
+        """Marshal a single object given this plan (wildcards excluded).
+
+        :param data: the object from which the fields are taken from
+        :param bool skip_none: whether or not to skip fields which value is None or empty
+        :param bool ordered: Wether or not to preserve order
+        """
+        out = OrderedDict() if ordered else {}
+        for key, output, nested in self.entries:
+            if output is None:
+                value = marshal(data, nested, skip_none=skip_none, ordered=ordered)
+            else:
+                value = output(key, data, ordered=ordered)
+            if skip_none and (value is None or value == {}):
+                continue
+            out[key] = value
+        return out
+
+    def encode(self, data, skip_none=False):
+        """Encode a single object as JSON text given this plan (wildcards excluded).
+
+        Values are written as they are output by the fields,
+        without building the marshalled dict.
+
+        :param data: the object from which the fields are taken from
+        :param bool skip_none: whether or not to skip fields which value is None or empty
+        :rtype: str
+        """
+        encoders = self.encoders
+        if encoders is None:
+            encoders = self.encoders = _compile_encoders(self)
+        chunks = []
+        for prefix, encode in encoders:
+            value = encode(data, skip_none)
+            if skip_none and (value == 'null' or value == '{}'):
+                continue
+            chunks.append(prefix + value)
+        return '{' + ','.join(chunks) + '}'
+
+
+def plan_for(fields):
+    """Get the marshalling plan for a fields set, compiling and caching it if possible.
+
+    The plan is cached on the fields object itself (as ``__plan__``)
+    when it supports attributes (ie. resolved models).
+
+    :param dict fields: the resolved fields dict
+    :rtype: Plan
+    """
+    plan = getattr(fields, '__plan__', None)
+    if plan is None:
+        plan = Plan(fields)
+        try:
+            fields.__plan__ = plan
+        except AttributeError:
+            pass  # Plain dicts can't hold the plan
+    return plan
+
+
+def marshal_json(data, fields, envelope=None, skip_none=False, mask=None):
+    """Marshal the objects straight to JSON.
+
+    This is equivalent to JSON encoding the result of :func:`marshal`
+    but the values are encoded as they are output by the fields
+    (with an encoder specialized for each field type),
+    without building the intermediate marshalled dicts.
+
+    :param data: the actual object(s) from which the fields are taken from
+    :param fields: a dict of whose keys will make up the final serialized
+                   response output
+    :param envelope: optional key that will be used to envelop the serialized
+                     response
+    :param bool skip_none: optional key will be used to eliminate fields
+                           which value is None or the field's key not
+                           exist in data
+    :returns: the compact JSON encoded output
+    :rtype: bytes
+
+
+    >>> from flask_restplus import fields, marshal_json
+    >>> mfields = { 'a': fields.Integer, 'c': fields.String }
+
+    >>> marshal_json({ 'a': 100, 'b': 'foo', 'c': 'bar' }, mfields)
+    b'{"a":100,"c":"bar"}'
+
+    >>> marshal_json([{ 'a': 100 }], mfields, envelope='data', skip_none=True)
+    b'{"data":[{"a":100}]}'
+
+    """
+    out = _encode(data, fields, skip_none, mask)
+    if envelope:
+        out = '{' + encode_text(envelope) + ':' + out + '}'
+    return out.encode('utf-8')
+
+
+def _encode(data, fields, skip_none=False, mask=None):
+    """Encode an object (or a list of objects) as JSON text"""
+    fields, plan = _compile(fields, mask)
+    if plan.has_wildcards:
+        # Wildcards are handled by `marshal` on the whole fields set
+        return encode_any(marshal(data, fields, skip_none=skip_none))
+    elif isinstance(data, (list, tuple)):
+        return _encode_rows(data, plan, skip_none)
+    return plan.encode(data, skip_none)
+
+
+def _encode_rows(rows, plan, skip_none):
+    """Encode each row of a collection as a JSON array given an already compiled plan"""
+    return '[' + ','.join(
+        _encode_rows(row, plan, skip_none) if isinstance(row, (list, tuple)) else plan.encode(row, skip_none)
+        for row in rows
+    ) + ']'
+
+
+def encode_any(value):
+    """Encode any JSON serializable value"""
+    return json.dumps(value, separators=(',', ':'))
+
+
+def encode_text(value):
+    """Encode a string value (other values are encoded with :func:`encode_any`)"""
+    return encode_basestring_ascii(value) if isinstance(value, string_types) else encode_any(value)
+
+
+def encode_int(value):
+    """Encode an integer value (other values are encoded with :func:`encode_any`)"""
+    return int.__repr__(value) if type(value) is int else encode_any(value)
+
+
+def encode_float(value):
+    """Encode a finite float value (other values are encoded with :func:`encode_any`)"""
+    if type(value) is float and not (math.isnan(value) or math.isinf(value)):
+        return float.__repr__(value)
+    return encode_any(value)
+
+
+def encode_bool(value):
+    """Encode a boolean value (other values are encoded with :func:`encode_any`)"""
+    if value is True:
+        return 'true'
+    elif value is False:
+        return 'false'
+    return encode_any(value)
+
+
+def _compile_encoders(plan):
+    """Get the ``(prefix, encode)`` pairs encoding each plan entry as a JSON object member"""
+    # ugly local import to avoid dependency loop
+    from .fields import Nested, List, Polymorph, _JSON_ENCODERS
+
+    encoders = []
+    for (key, output, nested), field in zip(plan.entries, plan.fields):
+        mask = plan.masks.get(key)
+        if output is None:
+            encode = _fields_encoder(nested)
+        elif type(field) in (Nested, Polymorph):
+            encode = _nested_encoder(key, field, mask)
+        elif type(field) is List and type(field.container) is Nested and field.container.attribute is None:
+            encode = _nested_list_encoder(key, field, output, mask)
+        elif type(field) is List and type(field.container) in _JSON_ENCODERS:
+            encode = _list_encoder(key, output, _JSON_ENCODERS[type(field.container)])
+        elif type(field) in _JSON_ENCODERS:
+            encode = _value_encoder(key, output, _JSON_ENCODERS[type(field)])
+        else:
+            # Fields with a custom output are encoded from their marshalled value
+            encode = _value_encoder(key, output, encode_any)
+        encoders.append((encode_text(text_type(key)) + ':', encode))
+    return tuple(encoders)
+
+
+def _fields_encoder(fields):
+    def encode(data, skip_none):
+        return _encode(data, fields, skip_none)
+    return encode
+
+
+def _value_encoder(key, output, encode_value):
+    def encode(data, skip_none):
+        return encode_value(output(key, data))
+    return encode
+
+
+def _list_encoder(key, output, encode_item):
+    def encode(data, skip_none):
+        items = output(key, data)
+        if not isinstance(items, list):
+            return encode_any(items)
+        return '[' + ','.join([encode_item(item) for item in items]) + ']'
+    return encode
+
+
+def _nested_encoder(key, field, mask):
+    from .fields import Polymorph, get_value
+
+    attribute = key if field.attribute is None else field.attribute
+    polymorph = isinstance(field, Polymorph)
+
+    def encode(data, skip_none):
+        value = get_value(attribute, data)
+        if value is None:
+            if field.allow_null:
+                return 'null'
+            elif field.default is not None:
+                return encode_any(field.default)
+        if polymorph:
+            return _encode(value, field.model_for(value.__class__), mask=mask or field.mask)
+        return _encode(value, field.nested, field.skip_none, mask)
+    return encode
+
+
+def _nested_list_encoder(key, field, output, mask):
+    from .fields import get_value, is_indexable_but_not_string
+
+    attribute = key if field.attribute is None else field.attribute
+    container = field.container
+
+    def encode_item(item):
+        if item is None:
+            if container.allow_null:
+                return 'null'
+            elif container.default is not None:
+                return encode_any(container.default)
+        return _encode(item, container.nested, container.skip_none, mask)
+
+    def encode(data, skip_none):
+        value = get_value(attribute, data)
+        if value is None or isinstance(value, dict) or not is_indexable_but_not_string(value):
+            # Defaults and single objects are handled by the field
+            return encode_any(output(key, data))
+        return '[' + ','.join([encode_item(item) for item in value]) + ']'
+    return encode
+
+
+class Marshalled(object):
+    """Objects pending marshalling with the fields to marshal them with.
+
+    :func:`~flask_restplus.representations.output_json` encodes them
+    straight to JSON (see :func:`marshal_json`)
+    while other representations get the usual marshalled output (see :meth:`marshal`).
+
+    :param data: the actual object(s) from which the fields are taken from
+    :param fields: a dict of whose keys will make up the final serialized
+                   response output
+    :param envelope: optional key that will be used to envelop the serialized
+                     response
+    :param bool skip_none: whether or not to skip fields which value is None or empty
+    :param bool ordered: Wether or not to preserve order (when marshalled)
+    """
+    __slots__ = ('data', 'fields', 'envelope', 'skip_none', 'mask', 'ordered')
+
+    def __init__(self, data, fields, envelope=None, skip_none=False, mask=None, ordered=False):
+        self.data = data
+        self.fields = fields
+        self.envelope = envelope
+        self.skip_none = skip_none
+        self.mask = mask
+        self.ordered = ordered
+
+    def marshal(self):
+        """Get the marshalled output"""
+        if isinstance(self.data, list):
+            return marshal_many(self.data, self.fields, self.envelope, self.skip_none, self.mask, self.ordered)
+        return marshal(self.data, self.fields, self.envelope, self.skip_none, self.mask, self.ordered)
+
+    def to_json(self):
+        """Get the compact JSON encoded output as bytes"""
+        return marshal_json(self.data, self.fields, self.envelope, self.skip_none, self.mask)
 
 
 class marshal_with(object):
@@ -224,18 +615,29 @@ class marshal_with(object):
 
     see :meth:`flask_restplus.marshal`
     """
-    def __init__(self, fields, envelope=None, skip_none=False, mask=None, ordered=False):
+    def __init__(self, fields, envelope=None, skip_none=False, mask=None, ordered=False, stream=False,
+                 fused=False):
         """
         :param fields: a dict of whose keys will make up the final
                        serialized response output
         :param envelope: optional key that will be used to envelop the serialized
                          response
+        :param bool stream: lazily marshal the returned iterable
+                            so it can be streamed as a JSON array
+        :param bool fused: return the objects pending marshalling (see :class:`Marshalled`)
+                           so JSON responses are encoded straight from them
         """
+        if stream and envelope:
+            raise ValueError('A streamed response can not be enveloped')
+        if stream and fused:
+            raise ValueError('A streamed response can not be fused')
         self.fields = fields
         self.envelope = envelope
         self.skip_none = skip_none
         self.ordered = ordered
         self.mask = Mask(mask, skip=True)
+        self.stream = stream
+        self.fused = fused
 
     def __call__(self, f):
         @wraps(f)
@@ -247,15 +649,20 @@ class marshal_with(object):
                 mask = request.headers.get(mask_header) or mask
             if isinstance(resp, tuple):
                 data, code, headers = unpack(resp)
-                return (
-                    marshal(data, self.fields, self.envelope, self.skip_none, mask, self.ordered),
-                    code,
-                    headers
-                )
+                return self.marshal(data, mask), code, headers
             else:
-                return marshal(resp, self.fields, self.envelope, self.skip_none, mask, self.ordered)
+                return self.marshal(resp, mask)
         return wrapper
 
+    def marshal(self, data, mask):
+        if self.fused:
+            return Marshalled(data, self.fields, self.envelope, self.skip_none, mask, self.ordered)
+        elif self.stream:
+            return marshal_iter(data, self.fields, self.skip_none, mask, self.ordered)
+        elif isinstance(data, list):
+            return marshal_many(data, self.fields, self.envelope, self.skip_none, mask, self.ordered)
+        return marshal(data, self.fields, self.envelope, self.skip_none, mask, self.ordered)
+
 
 class marshal_with_field(object):
     """
@@ -4,6 +4,7 @@ from __future__ import unicode_literals, absolute_import
 import logging
 import re
 import six
+import threading
 
 from collections import OrderedDict
 from inspect import isclass
@@ -14,6 +15,9 @@ log = logging.getLogger(__name__)
 
 LEXER = re.compile(r'\{|\}|\,|[\w_:\-\*]+')
 
+#: Default maximum number of masked fields sets kept in cache
+DEFAULT_CACHE_SIZE = 128
+
 
 class MaskError(RestError):
     '''Raised when an error occurs on mask'''
@@ -177,3 +181,181 @@ def apply(data, mask, skip=False):
 
     '''
     return Mask(mask, skip).apply(data)
+
+
+class MaskedView(object):
+    '''
+    An immutable masked projection over a fields set.
+
+    Unlike :meth:`Mask.apply`, fields are never cloned:
+    the view references the original fields and only holds the selected keys
+    and the sub-masks to give the nested fields at output time.
+    Custom fields which may not forward a sub-mask to their output are cloned once instead.
+    Missing fields are skipped.
+
+    :param fields: the (resolved) fields set to mask
+    :param str|Mask mask: the mask (parsed or not)
+    :raises MaskError: when the mask is inconsistent with the fields
+    '''
+    __slots__ = ('fields', 'mask', 'masks', 'clones', '_keys', '__plan__')
+
+    def __init__(self, fields, mask):
+        self.fields = fields
+        self.mask = Mask(mask, skip=True)
+        self.masks = {}
+        self.clones = {}
+        self.__plan__ = None
+
+        keys = []
+        for key, content in six.iteritems(self.mask):
+            if key == '*' or key not in fields:
+                continue
+            elif isinstance(content, Mask):
+                field = fields[key]
+                masked = self._check(field, content)
+                if isinstance(masked, MaskedView) or _forwards_mask(field):
+                    self.masks[key] = masked
+                else:
+                    self.clones[key] = field.clone(masked)
+            keys.append(key)
+
+        if '*' in self.mask:
+            keys.extend([key for key in fields if key not in keys])
+        self._keys = tuple(keys)
+
+    @staticmethod
+    def _check(field, mask):
+        '''Ensure a sub-mask can be applied on a field and get what is given to this field'''
+        from . import fields
+        if isinstance(field, (dict, OrderedDict)):
+            # Raw nested fields dicts are replaced by their own view
+            return cache.get(field, mask, MaskedView)
+        elif isinstance(field, fields.List):
+            MaskedView._check(field.container, mask)
+        elif isinstance(field, fields.Polymorph):
+            pass  # Models are only known for a given object class
+        elif isinstance(field, fields.Nested):
+            # Fail early and warm the cache with the nested view (marshalling masks resolved models)
+            nested = field.nested
+            cache.get(getattr(nested, 'resolved', nested), mask, MaskedView)
+        elif not (type(field) is fields.Raw or field == fields.Raw):
+            # Not possible to apply a mask on these remaining fields types
+            raise MaskError('Mask is inconsistent with model')
+        return mask
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        if key in self.clones:
+            return self.clones[key]
+        mask = self.masks.get(key)
+        return mask if isinstance(mask, MaskedView) else self.fields[key]
+
+    def get(self, key, default=None):
+        return self[key] if key in self._keys else default
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def keys(self):
+        return list(self._keys)
+
+    def items(self):
+        return [(key, self[key]) for key in self._keys]
+
+    def __repr__(self):
+        return '<MaskedView {0}>'.format(self.mask)
+
+
+def _forwards_mask(field):
+    '''Whether a field output is known to apply a sub-mask given as ``mask`` argument'''
+    from . import fields
+    cls = field if isclass(field) else type(field)
+    if cls.output not in (fields.Raw.output, fields.Nested.output, fields.List.output, fields.Polymorph.output):
+        return False
+    return not isinstance(field, fields.List) or _forwards_mask(field.container)
+
+
+class MaskCache(object):
+    '''
+    A bounded LRU cache of masked fields sets.
+
+    Entries are keyed on the fields set identity and the mask
+    (its string representation as received in headers or the parsed :class:`Mask` identity)
+    so a given mask is only parsed and applied once per model.
+    Cached entries keep a reference on the fields set and the mask.
+
+    :param int size: the maximum number of entries to keep (``0`` disables caching)
+    '''
+    def __init__(self, size=DEFAULT_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fields, mask, factory):
+        '''
+        Get the cached result of ``factory(fields, mask)``, computing it on cache miss.
+
+        :param fields: the fields set to mask
+        :param str|Mask mask: the mask (parsed or not)
+        :param callable factory: computes the masked result from ``fields`` and ``mask``
+        '''
+        key = (id(fields), mask if isinstance(mask, six.string_types) else id(mask))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        result = factory(fields, mask)
+
+        if self.size > 0:
+            with self._lock:
+                self._entries[key] = (fields, mask, result)
+                while len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+        return result
+
+    def resize(self, size):
+        '''Change the maximum number of cached entries, evicting the oldest ones if needed'''
+        with self._lock:
+            self.size = size
+            while len(self._entries) > max(size, 0):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        '''Empty the cache and reset its counters'''
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        '''
+        Get the cache statistics
+
+        :rtype: dict
+        '''
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': self.size,
+            'length': len(self._entries),
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+#: The masked fields sets cache used by marshalling
+cache = MaskCache()
@@ -6,14 +6,16 @@ import re
 import warnings
 
 from collections import OrderedDict, MutableMapping
-from six import iteritems, itervalues
+from six import iteritems
 from werkzeug.utils import cached_property
 
 from .mask import Mask
 from .errors import abort
 
 from .format import ExtendedDraft4Validator
-from jsonschema.exceptions import ValidationError
+from .validation import (
+    CompiledValidator, UnsupportedSchema, DEFAULT_CHUNK_SIZE, iter_errors, iter_collection_errors
+)
 
 from .utils import not_none
 from ._http import HTTPStatus
@@ -28,6 +30,28 @@ def instance(cls):
     return cls
 
 
+def with_attributes(field, **attributes):
+    '''
+    Get a field with some attributes set without modifying the original field.
+
+    Fields are shared between models (resolved fields, clones),
+    so a field is only copied if some attribute value actually changes.
+
+    :param field: a field instance or class
+    :param attributes: the attributes to set
+    '''
+    if isinstance(field, type):
+        field = field()
+    elif all(getattr(field, name, None) == value for name, value in iteritems(attributes)):
+        return field
+    else:
+        # Copies don't keep the cached schema which reflects the original attributes
+        field = copy.copy(field)
+    for name, value in iteritems(attributes):
+        setattr(field, name, value)
+    return field
+
+
 class ModelBase(object):
     '''
     Handles validation and swagger style inheritance for both subclasses.
@@ -37,6 +61,8 @@ class ModelBase(object):
     '''
 
     def __init__(self, name, *args, **kwargs):
+        self._validators = {}
+        self._cached_schema = None
         super(ModelBase, self).__init__(*args, **kwargs)
         self.__apidoc__ = {
             'name': name
@@ -69,6 +95,8 @@ class ModelBase(object):
 
     @property
     def __schema__(self):
+        if self._cached_schema is not None:
+            return self._cached_schema
         schema = self._schema
 
         if self.__parents__:
@@ -77,11 +105,11 @@ class ModelBase(object):
                 for parent in self.__parents__
             ]
 
-            return {
+            schema = {
                 'allOf': refs + [schema]
             }
-        else:
-            return schema
+        self._cached_schema = schema
+        return schema
 
     @classmethod
     def inherit(cls, name, *parents):
@@ -94,13 +122,81 @@ class ModelBase(object):
         model.__parents__ = parents[:-1]
         return model
 
-    def validate(self, data, resolver=None, format_checker=None):
-        validator = ExtendedDraft4Validator(self.__schema__, resolver=resolver, format_checker=format_checker)
-        try:
-            validator.validate(data)
-        except ValidationError:
+    def validator(self, resolver=None, format_checker=None, compiled=False):
+        '''
+        Get the JSON schema validator for this model.
+
+        Validators are built once for a given resolver and format checker.
+
+        :param RefResolver resolver: an optional resolver for the schema references
+        :param FormatChecker format_checker: an optional format checker
+        :param bool compiled: Use a :class:`~flask_restplus.validation.CompiledValidator`
+            if the schema can be compiled
+        '''
+        key = (id(resolver), id(format_checker), compiled)
+        cached = self._validators.get(key)
+        if cached is None:
+            validator = None
+            if compiled:
+                try:
+                    validator = CompiledValidator(self.__schema__, resolver=resolver, format_checker=format_checker)
+                except UnsupportedSchema:
+                    pass
+            if validator is None:
+                validator = ExtendedDraft4Validator(self.__schema__, resolver=resolver, format_checker=format_checker)
+            # Keep references on the key components so their ids can't be reused
+            cached = self._validators[key] = (resolver, format_checker, validator)
+        return cached[2]
+
+    def invalidate(self):
+        '''
+        Drop everything cached from this model definition (schema and validators).
+
+        This is automatically called when fields are added or removed
+        but needs to be called explicitly when an existing field is modified in place.
+        '''
+        self._validators = {}
+        self._cached_schema = None
+
+    def validate(self, data, resolver=None, format_checker=None, compiled=False, max_errors=None):
+        '''
+        Validate a payload against this model and abort with a ``400 Bad Request`` on failure.
+
+        The payload is traversed only once, collecting at most ``max_errors`` errors.
+
+        :param RefResolver resolver: an optional resolver for the schema references
+        :param FormatChecker format_checker: an optional format checker
+        :param bool compiled: Use a compiled validator if possible
+        :param int max_errors: the maximum number of errors reported (all if ``None``)
+        '''
+        validator = self.validator(resolver, format_checker, compiled)
+        errors = list(iter_errors(validator, data, max_errors))
+        if errors:
+            abort(HTTPStatus.BAD_REQUEST, message='Input payload validation failed',
+                  errors=dict(self.format_error(e) for e in errors))
+
+    def validate_many(self, data, resolver=None, format_checker=None, compiled=False, max_errors=None,
+                      executor=None, chunk_size=None):
+        '''
+        Validate a list of payloads against this model and abort with a ``400 Bad Request`` on failure.
+
+        All items are validated with the same validator
+        and errors are reported for the whole list, indexed by position (ie. ``3.name``).
+
+        :param list data: the payloads to validate
+        :param RefResolver resolver: an optional resolver for the schema references
+        :param FormatChecker format_checker: an optional format checker
+        :param bool compiled: Use a compiled validator if possible
+        :param int max_errors: the maximum number of errors reported (all if ``None``)
+        :param Executor executor: an optional executor to validate large lists in chunks concurrently
+        :param int chunk_size: the number of items validated by each executor task
+        '''
+        validator = self.validator(resolver, format_checker, compiled)
+        errors = list(iter_collection_errors(validator, data, max_errors, executor,
+                                             chunk_size or DEFAULT_CHUNK_SIZE))
+        if errors:
             abort(HTTPStatus.BAD_REQUEST, message='Input payload validation failed',
-                  errors=dict(self.format_error(e) for e in validator.iter_errors(data)))
+                  errors=dict(self.format_error(e) for e in errors))
 
     def format_error(self, error):
         path = list(error.path)
@@ -137,6 +233,42 @@ class RawModel(ModelBase):
             return self.__class__.clone(name, self, *parents, partial=partial, required=required, optional=optional)
         self.clone = instance_clone
 
+    def invalidate(self):
+        super(RawModel, self).invalidate()
+        # The resolved fields hold the compiled marshalling plan
+        self.__dict__.pop('resolved', None)
+
+    def __setitem__(self, key, value):
+        super(RawModel, self).__setitem__(key, value)
+        self.invalidate()
+
+    def __delitem__(self, key):
+        super(RawModel, self).__delitem__(key)
+        self.invalidate()
+
+    def update(self, *args, **kwargs):
+        super(RawModel, self).update(*args, **kwargs)
+        self.invalidate()
+
+    def pop(self, *args):
+        value = super(RawModel, self).pop(*args)
+        self.invalidate()
+        return value
+
+    def popitem(self, *args):
+        item = super(RawModel, self).popitem(*args)
+        self.invalidate()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super(RawModel, self).setdefault(key, default)
+        self.invalidate()
+        return value
+
+    def clear(self):
+        super(RawModel, self).clear()
+        self.invalidate()
+
     @property
     def _schema(self):
         properties = self.wrapper()
@@ -162,22 +294,25 @@ class RawModel(ModelBase):
     def resolved(self):
         '''
         Resolve real fields before submitting them to marshal
+
+        Fields instances are shared with this model and its parents,
+        only the discriminator field is copied.
         '''
-        # Duplicate fields
-        resolved = copy.deepcopy(self)
+        resolved = self.__class__(self.name, list(iteritems(self)), mask=self.__mask__)
 
-        # Recursively copy parent fields if necessary
+        # Recursively merge parent fields if necessary
         for parent in self.__parents__:
             resolved.update(parent.resolved)
 
         # Handle discriminator
-        candidates = [f for f in itervalues(resolved) if getattr(f, 'discriminator', None)]
+        candidates = [(k, f) for k, f in iteritems(resolved) if getattr(f, 'discriminator', None)]
         # Ensure the is only one discriminator
         if len(candidates) > 1:
             raise ValueError('There can only be one discriminator by schema')
         # Ensure discriminator always output the model name
         elif len(candidates) == 1:
-            candidates[0].default = self.name
+            key, field = candidates[0]
+            resolved[key] = with_attributes(field, default=self.name)
 
         return resolved
 
@@ -201,6 +336,9 @@ class RawModel(ModelBase):
         '''
         Clone these models (Duplicate all fields)
 
+        The fields instances are shared with the original models
+        unless they need to be modified (see ``required`` and ``optional``).
+
         It can be used from the class
 
         >>> model = Model.clone(fields_1, fields_2)
@@ -217,7 +355,7 @@ class RawModel(ModelBase):
         '''
         fields = cls.wrapper()
         for parent in parents:
-            fields.update(copy.deepcopy(parent))
+            fields.update(parent)
 
         def _wrap(data):
             if not isinstance(data, (list, tuple)):
@@ -228,14 +366,14 @@ class RawModel(ModelBase):
             fields = {k: v for (k, v) in fields.items() if k in partial}
 
         if optional is not None:
-            optional = fields if optional is True else _wrap(optional)
+            optional = list(fields) if optional is True else _wrap(optional)
             for field in optional:
-                fields[field].required = False
+                fields[field] = with_attributes(fields[field], required=False)
 
         if required is not None:
-            required = fields if required is True else _wrap(required)
+            required = list(fields) if required is True else _wrap(required)
             for field in required:
-                fields[field].required = True
+                fields[field] = with_attributes(fields[field], required=True)
 
         return cls(name, fields)
 
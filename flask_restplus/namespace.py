@@ -241,7 +241,12 @@ class Namespace(object):
         return wrapper
 
     def marshal_list_with(self, fields, **kwargs):
-        '''A shortcut decorator for :meth:`~Api.marshal_with` with ``as_list=True``'''
+        '''
+        A shortcut decorator for :meth:`~Api.marshal_with` with ``as_list=True``
+
+        Use ``stream=True`` to lazily marshal a returned iterable (ie. a generator)
+        and stream it as a JSON array, keeping memory usage bounded.
+        '''
         return self.marshal_with(fields, True, **kwargs)
 
     def marshal(self, *args, **kwargs):
@@ -6,11 +6,26 @@ try:
 except ImportError:
     from json import dumps
 
-from flask import make_response, current_app
+try:
+    from collections.abc import Iterator
+except ImportError:
+    from collections import Iterator
+
+from flask import make_response, current_app, stream_with_context
+
+from .marshalling import Marshalled
 
 
 def output_json(data, code, headers=None):
-    '''Makes a Flask response with a JSON encoded body'''
+    '''
+    Makes a Flask response with a JSON encoded body
+
+    An iterator (ie. a generator) is streamed as a JSON array,
+    each item being encoded as it is consumed.
+
+    :class:`~flask_restplus.marshalling.Marshalled` objects are encoded straight to JSON
+    unless some JSON settings need to be honoured.
+    '''
 
     settings = current_app.config.get('RESTPLUS_JSON', {})
 
@@ -20,6 +35,19 @@ def output_json(data, code, headers=None):
     if current_app.debug:
         settings.setdefault('indent', 4)
 
+    if isinstance(data, Marshalled):
+        if not settings:
+            resp = make_response(data.to_json() + b'\n', code)
+            resp.headers.extend(headers or {})
+            return resp
+        data = data.marshal()
+
+    if isinstance(data, Iterator):
+        body = stream_with_context(stream_json(data, settings))
+        resp = current_app.response_class(body, code)
+        resp.headers.extend(headers or {})
+        return resp
+
     # always end the json dumps with a new line
     # see https://github.com/mitsuhiko/flask/pull/1262
     dumped = dumps(data, **settings) + "\n"
@@ -27,3 +55,14 @@ def output_json(data, code, headers=None):
     resp = make_response(dumped, code)
     resp.headers.extend(headers or {})
     return resp
+
+
+def stream_json(items, settings=None):
+    '''Encode an iterable as a JSON array, one chunk per item'''
+    settings = settings or {}
+    separator = ', '
+    yield '['
+    for idx, item in enumerate(items):
+        chunk = dumps(item, **settings)
+        yield separator + chunk if idx else chunk
+    yield ']\n'
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-from flask import request
+from flask import current_app, request
 from flask.views import MethodView
 from werkzeug.wrappers import BaseResponse
 
+from .marshalling import Marshalled
 from .model import ModelBase
+from .representations import output_json
 
 from .utils import unpack
 
@@ -51,6 +53,8 @@ class Resource(MethodView):
         mediatype = request.accept_mimetypes.best_match(representations, default=None)
         if mediatype in representations:
             data, code, headers = unpack(resp)
+            if isinstance(data, Marshalled) and representations[mediatype] is not output_json:
+                data = data.marshal()
             resp = representations[mediatype](data, code, headers)
             resp.headers['Content-Type'] = mediatype
             return resp
@@ -65,12 +69,15 @@ class Resource(MethodView):
         '''
         # TODO: proper content negotiation
         data = request.get_json()
-        if collection:
-            data = data if isinstance(data, list) else [data]
-            for obj in data:
-                expect.validate(obj, self.api.refresolver, self.api.format_checker)
+        max_errors = current_app.config.get('RESTPLUS_VALIDATION_MAX_ERRORS')
+        if collection and isinstance(data, list):
+            expect.validate_many(data, self.api.refresolver, self.api.format_checker,
+                                 self.api._compile_validators, max_errors, self.api.validation_executor,
+                                 current_app.config.get('RESTPLUS_VALIDATION_CHUNK_SIZE'))
         else:
-            expect.validate(data, self.api.refresolver, self.api.format_checker)
+            # A single object is also accepted where a collection is expected
+            expect.validate(data, self.api.refresolver, self.api.format_checker,
+                            self.api._compile_validators, max_errors)
 
     def validate_payload(self, func):
         '''Perform a payload validation on expected model if necessary'''
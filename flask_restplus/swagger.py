@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, absolute_import
 
+import hashlib
 import itertools
+import json
 import re
 
 from inspect import isclass, getdoc
@@ -140,18 +142,91 @@ def is_hidden(resource):
     return hasattr(resource, "__apidoc__") and resource.__apidoc__ is False
 
 
+def is_documented(ns):
+    '''
+    Determine whether a Namespace appears in the Swagger documentation
+    i.e. it has at least one Resource not hidden from documentation
+    '''
+    return any(not is_hidden(resource) for resource, urls, kwargs in ns.resources)
+
+
+#: The vendor extension holding the checksum of exported specifications
+CHECKSUM_KEY = 'x-restplus-checksum'
+
+
+def _stable(obj):
+    '''A stable JSON representation for objects found in documentation'''
+    if isinstance(obj, ModelBase):
+        return [obj.name, _canonical(obj.__schema__)]
+    if isinstance(obj, RequestParser):
+        return _canonical([arg.__schema__ for arg in obj.args])
+    if isinstance(obj, fields.Raw):
+        return _canonical(obj.__schema__)
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    return getattr(obj, '__qualname__', type(obj).__name__)
+
+
+def _canonical(obj):
+    '''Stringify the mappings keys so values with mixed keys types (ie. response codes) can be sorted'''
+    if isinstance(obj, dict) and not isinstance(obj, ModelBase):
+        return dict((str(key), _canonical(value)) for key, value in iteritems(obj))
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(value) for value in obj]
+    return obj
+
+
+def checksum(api):
+    '''
+    Compute a checksum of the API registered resources, models, representations, error handlers
+    and the configuration they are documented with, without rendering the specifications.
+
+    It is used to detect exported specifications drifting from the code.
+
+    :param Api api: the API to fingerprint
+    :rtype: str
+    '''
+    hasher = hashlib.sha1()
+
+    def update(*values):
+        hasher.update(json.dumps(_canonical(values), sort_keys=True, default=_stable).encode('utf-8'))
+
+    update(*(_v(getattr(api, attr)) for attr in (
+        'title', 'version', 'description', 'terms_url', 'contact', 'contact_email', 'contact_url',
+        'license', 'license_url', 'authorizations', 'security', 'tags', 'prefix', 'default_mediatype'
+    )))
+    update(sorted(api.representations), current_app.config.get('RESTPLUS_MASK_HEADER'),
+           current_app.config.get('RESTPLUS_MASK_SWAGGER'))
+    for exception, handler in sorted(iteritems(api.error_handlers), key=lambda item: item[0].__name__):
+        update(exception.__name__, getdoc(handler), getattr(handler, '__apidoc__', None))
+    for ns in api.namespaces:
+        update(ns.name, ns.description, ns.path, ns.authorizations, api.ns_paths.get(ns))
+        for resource, urls, kwargs in ns.resources:
+            update(resource.__module__, resource.__name__, urls, kwargs,
+                   getdoc(resource), getattr(resource, '__apidoc__', None))
+            for method in sorted(resource.methods or ()):
+                func = getattr(resource, method.lower(), None)
+                update(method, getdoc(func), getattr(func, '__apidoc__', None))
+    for name in sorted(api.models):
+        update(name, api.models[name].__schema__)
+    return hasher.hexdigest()
+
+
 class Swagger(object):
     '''
     A Swagger documentation wrapper for an API instance.
     '''
-    def __init__(self, api):
+    def __init__(self, api, fragments=None):
         self.api = api
         self._registered_models = {}
+        self.fragments = {} if fragments is None else fragments
 
-    def as_dict(self):
+    def as_dict(self, namespaces=None):
         '''
         Output the specification as a serializable ``dict``.
 
+        :param list namespaces: only output these namespaces paths, tags and the definitions they reference
+            (default to all namespaces)
         :returns: the full Swagger specification in a serializable format
         :rtype: dict
         '''
@@ -179,14 +254,21 @@ class Swagger(object):
 
         paths = {}
         tags = self.extract_tags(self.api)
+        if namespaces is None:
+            namespaces = self.api.namespaces
+        else:
+            names = set(ns.name for ns in namespaces)
+            tags = [tag for tag in tags if tag['name'] in names]
 
         # register errors
         responses = self.register_errors()
 
-        for ns in self.api.namespaces:
-            for resource, urls, kwargs in ns.resources:
-                for url in self.api.ns_urls(ns, urls):
-                    paths[extract_path(url)] = self.serialize_resource(ns, resource, url, kwargs)
+        for ns in namespaces:
+            fragment = self.fragments.get(ns)
+            if fragment is None:
+                fragment = self.fragments[ns] = self.serialize_namespace(ns)
+            paths.update(fragment['paths'])
+            self._registered_models.update(fragment['models'])
 
         # merge in the top-level authorizations
         for ns in self.api.namespaces:
@@ -195,6 +277,11 @@ class Swagger(object):
                     self.api.authorizations = {}
                 self.api.authorizations = merge(self.api.authorizations, ns.authorizations)
 
+        authorizations = self.api.authorizations
+        security = self.security_requirements(self.api.security)
+        if namespaces is not self.api.namespaces:
+            authorizations, security = self.restrict_security(namespaces, paths, authorizations, security)
+
         specs = {
             'swagger': '2.0',
             'basePath': basepath,
@@ -202,8 +289,8 @@ class Swagger(object):
             'info': infos,
             'produces': list(iterkeys(self.api.representations)),
             'consumes': ['application/json'],
-            'securityDefinitions': self.api.authorizations or None,
-            'security': self.security_requirements(self.api.security) or None,
+            'securityDefinitions': authorizations or None,
+            'security': security or None,
             'tags': tags,
             'definitions': self.serialize_definitions() or None,
             'responses': responses or None,
@@ -211,6 +298,60 @@ class Swagger(object):
         }
         return not_none(specs)
 
+    def restrict_security(self, namespaces, paths, authorizations, security):
+        '''
+        Restrict the security definitions and requirements to the ones used by some namespaces.
+
+        The root security requirements are only kept if an operation does not override them
+        and only the authorizations declared by the namespaces or required by their operations are kept.
+
+        :param list namespaces: the namespaces to restrict the security to
+        :param dict paths: the serialized paths of these namespaces
+        :param dict authorizations: all the security definitions
+        :param list security: the root security requirements
+        :returns: the restricted security definitions and root security requirements
+        :rtype: tuple
+        '''
+        operations = [
+            operation
+            for path in itervalues(paths)
+            for operation in itervalues(path)
+            if isinstance(operation, dict)
+        ]
+        if all('security' in operation for operation in operations):
+            security = None
+        requirements = list(security or [])
+        for operation in operations:
+            requirements.extend(operation.get('security') or [])
+
+        names = set(name for requirement in requirements for name in requirement)
+        for ns in namespaces:
+            names.update(ns.authorizations or {})
+        authorizations = dict(
+            (name, definition) for name, definition in iteritems(authorizations or {}) if name in names
+        )
+        return authorizations, security
+
+    def serialize_namespace(self, ns):
+        '''
+        Serialize the paths of a single namespace.
+
+        :param Namespace ns: the namespace to serialize
+        :returns: a fragment holding the namespace ``paths``
+            and the ``models`` (by name) they reference
+        :rtype: dict
+        '''
+        registered, self._registered_models = self._registered_models, {}
+        try:
+            paths = {}
+            for resource, urls, kwargs in ns.resources:
+                for url in self.api.ns_urls(ns, urls):
+                    paths[extract_path(url)] = self.serialize_resource(ns, resource, url, kwargs)
+            return {'paths': paths, 'models': self._registered_models}
+        finally:
+            registered.update(self._registered_models)
+            self._registered_models = registered
+
     def get_host(self):
         hostname = current_app.config.get('SERVER_NAME', None) or None
         if hostname and self.api.blueprint and self.api.blueprint.subdomain:
@@ -232,12 +373,8 @@ class Swagger(object):
             tags.append(tag)
             by_name[tag['name']] = tag
         for ns in api.namespaces:
-            # hide namespaces without any Resources
-            if not ns.resources:
-                continue
-            # hide namespaces with all Resources hidden from Swagger documentation
-            resources = (resource for resource, urls, kwargs in ns.resources)
-            if all(is_hidden(r) for r in resources):
+            # hide namespaces without any Resources or with all Resources hidden from Swagger documentation
+            if not is_documented(ns):
                 continue
             if ns.name not in by_name:
                 tags.append({
@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+'''
+Compile JSON schemas into specialised Python validation functions.
+
+The generated code mirrors :class:`~flask_restplus.format.ExtendedDraft4Validator`:
+default values are injected, unknown properties are stripped
+and errors are the same :class:`jsonschema.ValidationError` objects.
+Schemas using keywords the compiler does not handle raise :class:`UnsupportedSchema`
+so the caller can fall back on the generic jsonschema validator.
+'''
+from __future__ import unicode_literals, absolute_import
+
+import numbers
+import re
+
+from itertools import chain, islice
+
+from jsonschema import RefResolver
+from jsonschema.compat import int_types, str_types
+from jsonschema.exceptions import FormatError, RefResolutionError, ValidationError
+
+from .format import ExtendedDraft4Validator
+
+
+#: Default number of collection items validated by each worker task
+DEFAULT_CHUNK_SIZE = 500
+
+#: Type name to Python check expression (draft 4 semantics: booleans are not numbers)
+TYPE_CHECKS = {
+    'array': 'isinstance({0}, list)',
+    'boolean': 'isinstance({0}, bool)',
+    'integer': '(isinstance({0}, int_types) and not isinstance({0}, bool))',
+    'null': '{0} is None',
+    'number': '(isinstance({0}, Number) and not isinstance({0}, bool))',
+    'object': 'isinstance({0}, dict)',
+    'string': 'isinstance({0}, str_types)',
+}
+
+
+class UnsupportedSchema(Exception):
+    '''Raised when a schema can't be compiled'''
+    pass
+
+
+class ErrorLimitReached(Exception):
+    '''Raised by :class:`ErrorList` to stop a compiled validation'''
+    pass
+
+
+class ErrorList(list):
+    '''
+    A list of errors interrupting the validation once full.
+
+    :param int limit: the maximum number of errors to collect
+    '''
+    def __init__(self, limit):
+        super(ErrorList, self).__init__()
+        self.limit = limit
+
+    def append(self, error):
+        super(ErrorList, self).append(error)
+        if len(self) >= self.limit:
+            raise ErrorLimitReached()
+
+
+class SchemaCompiler(object):
+    '''
+    Generate the source code of the validation functions for a schema.
+
+    Each generated function has the ``(instance, path, errors)`` signature
+    and appends every error found to ``errors``.
+    Referenced schemas are compiled once into their own function.
+
+    :param RefResolver resolver: the resolver for the schema references
+    :param FormatChecker format_checker: an optional format checker
+    '''
+    def __init__(self, resolver, format_checker=None):
+        self.resolver = resolver
+        self.format_checker = format_checker
+        self.namespace = {
+            'FormatError': FormatError,
+            'Number': numbers.Number,
+            'ValidationError': ValidationError,
+            'format_checker': format_checker,
+            'int_types': int_types,
+            'str_types': str_types,
+        }
+        self.references = {}
+        self.functions = []
+        self.counter = 0
+
+    def compile(self, schema):
+        '''Compile a schema into a validation function'''
+        name = self.function(schema)
+        source = '\n\n'.join(self.functions)
+        exec(compile(source, '<compiled schema>', 'exec'), self.namespace)
+        return self.namespace[name]
+
+    def unique(self, prefix):
+        self.counter += 1
+        return '{0}_{1}'.format(prefix, self.counter)
+
+    def constant(self, value):
+        '''Store a value in the generated code namespace and return its name'''
+        name = self.unique('const')
+        self.namespace[name] = value
+        return name
+
+    def function(self, schema, name=None):
+        name = name or self.unique('validate')
+        body = self.schema(schema, 'instance', 'path', 1)
+        self.functions.append('\n'.join(['def {0}(instance, path, errors):'.format(name)] + (body or ['    pass'])))
+        return name
+
+    def reference(self, ref):
+        try:
+            url, resolved = self.resolver.resolve(ref)
+        except RefResolutionError as e:
+            raise UnsupportedSchema(str(e))
+        if url not in self.references:
+            name = self.references[url] = self.unique('ref')
+            self.resolver.push_scope(url)
+            try:
+                self.function(resolved, name)
+            finally:
+                self.resolver.pop_scope()
+        return self.references[url]
+
+    def schema(self, schema, var, path, depth):
+        '''Generate the validation lines for ``var`` against ``schema``'''
+        if not isinstance(schema, dict):
+            raise UnsupportedSchema('Boolean schemas are not supported')
+        if isinstance(schema.get('id'), str_types):
+            raise UnsupportedSchema('Resolution scope changes are not supported')
+        indent = '    ' * depth
+        if '$ref' in schema:
+            return ['{0}{1}({2}, {3}, errors)'.format(indent, self.reference(schema['$ref']), var, path)]
+        lines = []
+        for keyword, value in schema.items():
+            emit = self.KEYWORDS.get(keyword)
+            if emit is None:
+                if keyword in ExtendedDraft4Validator.VALIDATORS:
+                    raise UnsupportedSchema('Unsupported keyword: {0}'.format(keyword))
+                continue  # Annotations are ignored as jsonschema does
+            lines.extend(emit(self, value, schema, var, path, depth))
+        return lines
+
+    def error(self, depth, keyword, message, var, path, **kwargs):
+        extra = ''.join(', {0}={1}'.format(k, v) for k, v in kwargs.items())
+        return '{0}errors.append(ValidationError({1}, validator={2!r}, path={3}, instance={4}{5}))'.format(
+            '    ' * depth, message, keyword, path, var, extra
+        )
+
+    def check(self, condition, keyword, template, var, path, depth):
+        '''A single ``if condition: error`` block with a ``%r`` message template'''
+        message = '{0} % ({1},)'.format(self.constant(template), var)
+        return [
+            '{0}if {1}:'.format('    ' * depth, condition.format(var)),
+            self.error(depth + 1, keyword, message, var, path),
+        ]
+
+    def emit_type(self, value, schema, var, path, depth):
+        types = value if isinstance(value, list) else [value]
+        if any(t not in TYPE_CHECKS for t in types):
+            raise UnsupportedSchema('Unsupported type: {0}'.format(value))
+        condition = 'not ({0})'.format(' or '.join(TYPE_CHECKS[t] for t in types))
+        template = '%r is not of type ' + ', '.join(repr(t) for t in types)
+        return self.check(condition, 'type', template, var, path, depth)
+
+    def emit_properties(self, value, schema, var, path, depth):
+        indent = '    ' * depth
+        known = self.constant(frozenset(value))
+        lines = ['{0}if isinstance({1}, dict):'.format(indent, var)]
+        for prop, subschema in value.items():
+            if isinstance(subschema, dict) and 'default' in subschema:
+                lines.append('{0}    {1}.setdefault({2!r}, {3})'.format(
+                    indent, var, prop, self.constant(subschema['default'])))
+        lines.extend([
+            '{0}    if not {1}.issuperset({2}):'.format(indent, known, var),
+            '{0}        for key in [k for k in {1} if k not in {2}]:'.format(indent, var, known),
+            '{0}            del {1}[key]'.format(indent, var),
+        ])
+        for prop, subschema in value.items():
+            item = self.unique('value')
+            body = self.schema(subschema, item, '{0} + ({1!r},)'.format(path, prop), depth + 2)
+            if body:
+                lines.append('{0}    if {1!r} in {2}:'.format(indent, prop, var))
+                lines.append('{0}        {1} = {2}[{3!r}]'.format(indent, item, var, prop))
+                lines.extend(body)
+        return lines
+
+    def emit_required(self, value, schema, var, path, depth):
+        if not isinstance(value, list):
+            raise UnsupportedSchema('Required must be a list')
+        if not value:
+            return []
+        indent = '    ' * depth
+        lines = ['{0}if isinstance({1}, dict):'.format(indent, var)]
+        for prop in value:
+            lines.append('{0}    if {1!r} not in {2}:'.format(indent, prop, var))
+            message = self.constant('%r is a required property' % prop)
+            lines.append(self.error(depth + 2, 'required', message, var, path))
+        return lines
+
+    def emit_items(self, value, schema, var, path, depth):
+        if not isinstance(value, dict):
+            raise UnsupportedSchema('Tuple validation is not supported')
+        index, item = self.unique('index'), self.unique('value')
+        body = self.schema(value, item, '{0} + ({1},)'.format(path, index), depth + 2)
+        if not body:
+            return []
+        indent = '    ' * depth
+        return [
+            '{0}if isinstance({1}, list):'.format(indent, var),
+            '{0}    for {1}, {2} in enumerate({3}):'.format(indent, index, item, var),
+        ] + body
+
+    def emit_allOf(self, value, schema, var, path, depth):
+        lines = []
+        for subschema in value:
+            lines.extend(self.schema(subschema, var, path, depth))
+        return lines
+
+    def emit_enum(self, value, schema, var, path, depth):
+        if not all(isinstance(v, str_types) for v in value):
+            # Non string enums need jsonschema's boolean/number disambiguation
+            raise UnsupportedSchema('Only string enums are supported')
+        condition = '{{0}} not in {0}'.format(self.constant(tuple(value)))
+        template = '%r is not one of ' + repr(value).replace('%', '%%')
+        return self.check(condition, 'enum', template, var, path, depth)
+
+    def emit_format(self, value, schema, var, path, depth):
+        if self.format_checker is None or value not in self.format_checker.checkers:
+            return []
+        indent = '    ' * depth
+        return [
+            '{0}try:'.format(indent),
+            '{0}    format_checker.check({1}, {2!r})'.format(indent, var, value),
+            '{0}except FormatError as error:'.format(indent),
+            self.error(depth + 1, 'format', 'error.message', var, path, cause='error.cause'),
+        ]
+
+    def emit_pattern(self, value, schema, var, path, depth):
+        pattern = self.constant(re.compile(value))
+        condition = 'isinstance({{0}}, str_types) and not {0}.search({{0}})'.format(pattern)
+        template = '%r does not match ' + repr(value).replace('%', '%%')
+        return self.check(condition, 'pattern', template, var, path, depth)
+
+    def emit_minimum(self, value, schema, var, path, depth):
+        op, cmp = ('<=', 'less than or equal to') if schema.get('exclusiveMinimum', False) else ('<', 'less than')
+        return self.bound(value, op, cmp, 'minimum', var, path, depth)
+
+    def emit_maximum(self, value, schema, var, path, depth):
+        op, cmp = ('>=', 'greater than or equal to') if schema.get('exclusiveMaximum', False) else ('>', 'greater than')
+        return self.bound(value, op, cmp, 'maximum', var, path, depth)
+
+    def bound(self, value, op, cmp, keyword, var, path, depth):
+        condition = '{0} and {{0}} {1} {2}'.format(TYPE_CHECKS['number'], op, self.constant(value))
+        template = '%r is {0} the {1} of {2!r}'.format(cmp, keyword, value)
+        return self.check(condition, keyword, template, var, path, depth)
+
+    def emit_multipleOf(self, value, schema, var, path, depth):
+        factor = self.constant(value)
+        if isinstance(value, float):
+            failed = 'int({{0}} / {0}) != {{0}} / {0}'.format(factor)
+        else:
+            failed = '{{0}} % {0}'.format(factor)
+        condition = '{0} and {1}'.format(TYPE_CHECKS['number'], failed)
+        template = '%r is not a multiple of ' + repr(value)
+        return self.check(condition, 'multipleOf', template, var, path, depth)
+
+    KEYWORDS = {
+        'allOf': emit_allOf,
+        'enum': emit_enum,
+        'format': emit_format,
+        'items': emit_items,
+        'maximum': emit_maximum,
+        'minimum': emit_minimum,
+        'multipleOf': emit_multipleOf,
+        'pattern': emit_pattern,
+        'properties': emit_properties,
+        'required': emit_required,
+        'type': emit_type,
+    }
+
+
+def _length(keyword, type, op, template):
+    def emit(self, value, schema, var, path, depth):
+        if not isinstance(value, int_types):
+            raise UnsupportedSchema('{0} must be an integer'.format(keyword))
+        condition = '{0} and len({{0}}) {1} {2!r}'.format(TYPE_CHECKS[type], op, value)
+        return self.check(condition, keyword, template, var, path, depth)
+    return emit
+
+
+SchemaCompiler.KEYWORDS.update({
+    'maxItems': _length('maxItems', 'array', '>', '%r is too long'),
+    'maxLength': _length('maxLength', 'string', '>', '%r is too long'),
+    'maxProperties': _length('maxProperties', 'object', '>', '%r has too many properties'),
+    'minItems': _length('minItems', 'array', '<', '%r is too short'),
+    'minLength': _length('minLength', 'string', '<', '%r is too short'),
+    'minProperties': _length('minProperties', 'object', '<', '%r does not have enough properties'),
+})
+
+
+class CompiledValidator(object):
+    '''
+    A drop-in replacement for :class:`~flask_restplus.format.ExtendedDraft4Validator`
+    running a validation function generated from the schema.
+
+    :param dict schema: the JSON schema to compile
+    :param RefResolver resolver: an optional resolver for the schema references
+    :param FormatChecker format_checker: an optional format checker
+    :raises UnsupportedSchema: if the schema can't be compiled
+    '''
+    def __init__(self, schema, resolver=None, format_checker=None):
+        self.schema = schema
+        self.resolver = resolver or RefResolver.from_schema(schema)
+        self.format_checker = format_checker
+        self._validate = SchemaCompiler(self.resolver, format_checker).compile(schema)
+
+    def iter_errors(self, instance, max_errors=None):
+        errors = ErrorList(max_errors) if max_errors else []
+        try:
+            self._validate(instance, (), errors)
+        except ErrorLimitReached:
+            pass
+        return iter(errors)
+
+    def is_valid(self, instance):
+        return next(self.iter_errors(instance), None) is None
+
+    def validate(self, instance):
+        for error in self.iter_errors(instance):
+            raise error
+
+
+def iter_errors(validator, instance, max_errors=None):
+    '''
+    Collect the validation errors of an instance in a single traversal.
+
+    :param validator: a jsonschema validator or a :class:`CompiledValidator`
+    :param instance: the instance to validate
+    :param int max_errors: stop the validation after this number of errors
+    '''
+    if isinstance(validator, CompiledValidator):
+        return validator.iter_errors(instance, max_errors=max_errors)
+    return islice(validator.iter_errors(instance), max_errors or None)
+
+
+def clone(validator):
+    '''
+    Get a validator for the same schema which can safely run in another thread.
+
+    jsonschema resolvers keep a scope stack while resolving references
+    so each thread needs its own. Compiled validators are stateless and returned as is.
+    '''
+    if isinstance(validator, CompiledValidator):
+        return validator
+    resolver = validator.resolver
+    resolver = RefResolver(resolver.base_uri, resolver.referrer, store=resolver.store)
+    return validator.__class__(validator.schema, resolver=resolver, format_checker=validator.format_checker)
+
+
+def iter_collection_errors(validator, instances, max_errors=None, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    Collect the validation errors of a list of instances in a single traversal.
+
+    Errors paths are prefixed by the instance position in the list.
+
+    :param validator: a jsonschema validator or a :class:`CompiledValidator`
+    :param list instances: the instances to validate
+    :param int max_errors: stop the validation after this number of errors
+    :param Executor executor: an optional executor to validate chunks concurrently
+    :param int chunk_size: the number of instances validated by each executor task
+    '''
+    if executor is None or len(instances) <= chunk_size:
+        return iter(_collection_errors(validator, instances, 0, max_errors))
+    futures = [
+        executor.submit(_collection_errors, clone(validator), instances[start:start + chunk_size], start, max_errors)
+        for start in range(0, len(instances), chunk_size)
+    ]
+    return islice(chain.from_iterable(future.result() for future in futures), max_errors or None)
+
+
+def _collection_errors(validator, instances, offset, max_errors=None):
+    errors = []
+    for index, instance in enumerate(instances, offset):
+        for error in iter_errors(validator, instance, max_errors - len(errors) if max_errors else None):
+            error.path.appendleft(index)
+            errors.append(error)
+        if max_errors and len(errors) >= max_errors:
+            break
+    return errors
@@ -2,7 +2,7 @@ import pytest
 
 from faker import Faker
 
-from flask_restplus import marshal, fields
+from flask_restplus import marshal, fields, Model
 
 fake = Faker()
 
@@ -17,6 +17,40 @@ family_fields = {
     'children': fields.List(fields.Nested(person_fields))
 }
 
+dynamic_fields = {
+    'name': fields.String,
+    '*': fields.Wildcard(fields.Integer),
+}
+
+base_fields = Model('Base', {'name': fields.String})
+polymorph_models = [base_fields.inherit('Sub{0}'.format(i), {'value': fields.Integer}) for i in range(12)]
+polymorph_classes = [type(str('Sub{0}'.format(i)), (object,), {'name': 'sub', 'value': i}) for i in range(12)]
+polymorph_fields = {
+    'item': fields.Polymorph(dict(zip(polymorph_classes, polymorph_models)))
+}
+
+url_fields = {
+    'id': fields.Integer,
+    'uri': fields.Url('item', absolute=True),
+}
+
+derived_fields = {
+    'kind': fields.ClassName(dash=True),
+    'label': fields.FormattedString('{name} ({age})'),
+}
+
+
+class Record(object):
+    def __init__(self, i):
+        self.name = 'record{0}'.format(i)
+        self.age = i
+        self.payload = dict(('attr{0}'.format(j), j) for j in range(30))
+        for j in range(30):
+            setattr(self, 'attr{0}'.format(j), j)
+
+
+ids_fields = {'ids': fields.List(fields.Integer)}
+
 
 def person():
     return {
@@ -33,6 +67,33 @@ def family():
     }
 
 
+@pytest.fixture
+def dynamic():
+    data = dict(('key{0}'.format(i), i) for i in range(5000))
+    data['name'] = 'dynamic'
+    return data
+
+
+@pytest.fixture
+def feed():
+    return [{'item': polymorph_classes[i % 12]()} for i in range(10000)]
+
+
+@pytest.fixture
+def rows():
+    return [{'id': i} for i in range(10000)]
+
+
+@pytest.fixture
+def records():
+    return [Record(i) for i in range(10000)]
+
+
+@pytest.fixture
+def ids():
+    return {'ids': list(range(100000))}
+
+
 def marshal_simple():
     return marshal(person(), person_fields)
 
@@ -51,6 +112,27 @@ def marshal_nested_with_mask(app):
         return marshal(family(), family_fields)
 
 
+def marshal_wildcard(data):
+    return marshal(data, dynamic_fields)
+
+
+def marshal_polymorph_feed(data):
+    return marshal(data, polymorph_fields)
+
+
+def marshal_urls(app, data):
+    with app.test_request_context('/'):
+        return marshal(data, url_fields)
+
+
+def marshal_derived(data):
+    return marshal(data, derived_fields)
+
+
+def marshal_ids(data):
+    return marshal(data, ids_fields)
+
+
 @pytest.mark.benchmark(group='marshalling')
 class MarshallingBenchmark(object):
     def bench_marshal_simple(self, benchmark):
@@ -64,3 +146,19 @@ class MarshallingBenchmark(object):
 
     def bench_marshal_nested_with_mask(self, app, benchmark):
         benchmark(marshal_nested_with_mask, app)
+
+    def bench_marshal_wildcard(self, dynamic, benchmark):
+        benchmark(marshal_wildcard, dynamic)
+
+    def bench_marshal_polymorph_feed(self, feed, benchmark):
+        benchmark(marshal_polymorph_feed, feed)
+
+    def bench_marshal_urls(self, app, rows, benchmark):
+        app.add_url_rule('/items/<int:id>', 'item', lambda id: id)
+        benchmark(marshal_urls, app, rows)
+
+    def bench_marshal_derived(self, records, benchmark):
+        benchmark(marshal_derived, records)
+
+    def bench_marshal_ids(self, ids, benchmark):
+        benchmark(marshal_ids, ids)
@@ -337,3 +337,75 @@ class APITest(object):
         assert decorator1.called is True
         assert decorator2.called is True
         assert decorator3.called is True
+
+    def _setup_warmup(self, api):
+        person = api.model('Person', {'name': restplus.fields.String(required=True)})
+
+        @api.route('/persons/')
+        class Persons(restplus.Resource):
+            @api.expect(person)
+            @api.marshal_with(person)
+            def post(self):
+                return api.payload
+
+        return person, Persons
+
+    def test_warmup(self, app, client, mocker):
+        api = restplus.Api(app, validate=True)
+        person, resource = self._setup_warmup(api)
+
+        api.warmup()
+
+        assert '__schema__' not in api.__dict__
+        assert set(api._schema_fragments) == set(api.namespaces)
+        assert '__plan__' in person.resolved.__dict__
+        expected = resource.post.__apidoc__['expect'][0]
+        assert expected._validators and person._validators
+
+        from flask_restplus.format import ExtendedDraft4Validator
+        serialize_namespace = mocker.spy(restplus.Swagger, 'serialize_namespace')
+        validator_class = mocker.patch('flask_restplus.model.ExtendedDraft4Validator', wraps=ExtendedDraft4Validator)
+        client.post_json('/persons/', {'name': 'John'})
+        client.post_json('/persons/', {}, status=400)
+        client.get_specs()
+        assert not serialize_namespace.called
+        assert not validator_class.called
+
+    def test_warmup_on_init_app(self, app):
+        app.config['RESTPLUS_WARMUP'] = True
+        api = restplus.Api()
+        person, resource = self._setup_warmup(api)
+
+        api.init_app(app)
+
+        assert '/persons/' in api._schema_fragments[api.default_namespace]['paths']
+
+    def test_warmup_keeps_request_base_path(self, app):
+        app.config['RESTPLUS_WARMUP'] = True
+        api = restplus.Api()
+        self._setup_warmup(api)
+        api.init_app(app)
+
+        specs = app.test_client().get_json('/swagger.json', environ_overrides={'SCRIPT_NAME': '/svc'})
+
+        assert specs['basePath'] == '/svc'
+
+    def test_warmup_outdated_by_new_resource(self, app):
+        api = restplus.Api(app)
+        api.warmup()
+
+        self._setup_warmup(api)
+
+        with app.test_request_context():
+            assert '/persons/' in api.__schema__['paths']
+
+    def test_warmup_gc_freeze(self, app, mocker):
+        import gc
+        freeze = mocker.patch.object(gc, 'freeze', create=True)
+        api = restplus.Api(app)
+
+        api.warmup()
+        assert not freeze.called
+
+        api.warmup(freeze=True)
+        assert freeze.called
@@ -91,6 +91,25 @@ class APIDocTest(object):
         response = client.get(url_for('doc'))
         assert 'displayRequestDuration: true' in str(response.data)
 
+    def test_apidoc_split_namespaces(self, app, client):
+        api = restplus.Api(app)
+        ns = api.namespace('ns')
+
+        @ns.route('/test/')
+        class Test(restplus.Resource):
+            def get(self):
+                return {}
+
+        response = client.get(url_for('doc'))
+        assert 'url: "{0}"'.format(api.specs_url) in str(response.data)
+        assert 'urls:' not in str(response.data)
+
+        app.config['SWAGGER_UI_SPLIT_NAMESPACES'] = True
+        response = client.get(url_for('doc'))
+        data = response.data.decode('utf8')
+        assert 'urls: [{"name": "ns", "url": "http://localhost/swagger/namespaces/ns.json"}]' in data
+        assert 'layout: "StandaloneLayout"' in data
+
     def test_custom_apidoc_url(self, app, client):
         restplus.Api(app, version='1.0', doc='/doc/')
 
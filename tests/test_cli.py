@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+
+from flask import Blueprint
+
+import flask_restplus as restplus
+
+from flask_restplus.swagger import CHECKSUM_KEY, checksum
+
+
+def setup_api(api):
+    person = api.model('Person', {'name': restplus.fields.String})
+
+    @api.route('/persons/')
+    class Persons(restplus.Resource):
+        @api.marshal_list_with(person)
+        def get(self):
+            return []
+
+    return api
+
+
+class ExportTest(object):
+    def test_export_specs(self, app, tmpdir):
+        api = setup_api(restplus.Api(app))
+        output = tmpdir.join('swagger.json')
+
+        result = app.test_cli_runner().invoke(args=['restplus', 'export', str(output)])
+
+        assert result.exit_code == 0, result.output
+        specs = json.loads(output.read())
+        assert specs.pop(CHECKSUM_KEY) == checksum(api)
+        with app.test_request_context():
+            assert specs == json.loads(json.dumps(api.__schema__))
+
+    def test_export_postman(self, app, tmpdir):
+        setup_api(restplus.Api(app))
+        output = tmpdir.join('postman.json')
+
+        result = app.test_cli_runner().invoke(args=['restplus', 'export', '--postman', str(output)])
+
+        assert result.exit_code == 0, result.output
+        collection = json.loads(output.read())
+        assert [r['url'] for r in collection['requests']] == ['http://localhost/persons/']
+
+    def test_export_requires_blueprint_with_many_apis(self, app, tmpdir):
+        app.register_blueprint(setup_api(restplus.Api(Blueprint('api1', __name__, url_prefix='/api1'))).blueprint)
+        app.register_blueprint(setup_api(restplus.Api(Blueprint('api2', __name__, url_prefix='/api2'))).blueprint)
+        output = tmpdir.join('swagger.json')
+
+        result = app.test_cli_runner().invoke(args=['restplus', 'export', str(output)])
+        assert result.exit_code != 0
+
+        result = app.test_cli_runner().invoke(args=['restplus', 'export', '-b', 'api2', str(output)])
+        assert result.exit_code == 0, result.output
+        assert json.loads(output.read())['basePath'] == '/api2'
+
+
+class ChecksumTest(object):
+    def test_mixed_response_codes(self, app):
+        api = restplus.Api(app)
+
+        @api.route('/persons/')
+        class Persons(restplus.Resource):
+            @api.response(404, 'Not found')
+            @api.response('default', 'Error')
+            def get(self):
+                return []
+
+        assert checksum(api) == checksum(api)
+
+    def test_parser_arguments(self, app):
+        def fingerprint(location):
+            api = restplus.Api(Blueprint('api', __name__))
+            parser = api.parser()
+            parser.add_argument('page', type=int, location=location)
+
+            @api.route('/persons/')
+            class Persons(restplus.Resource):
+                @api.expect(parser)
+                def get(self):
+                    return []
+
+            return checksum(api)
+
+        assert fingerprint('args') == fingerprint('args')
+        assert fingerprint('args') != fingerprint('headers')
+
+    def test_prefix(self, app):
+        assert checksum(restplus.Api(Blueprint('api', __name__))) != checksum(
+            restplus.Api(Blueprint('api', __name__), prefix='/v2'))
+
+    def test_representations(self, app):
+        api = restplus.Api(Blueprint('api', __name__))
+        before = checksum(api)
+
+        @api.representation('application/xml')
+        def xml(data, code, headers):
+            pass
+
+        assert checksum(api) != before
+
+    def test_mask_config(self, app):
+        api = restplus.Api(Blueprint('api', __name__))
+        before = checksum(api)
+
+        app.config['RESTPLUS_MASK_HEADER'] = 'X-Mask'
+        assert checksum(api) != before
+
+    def test_error_handlers(self, app):
+        api = restplus.Api(Blueprint('api', __name__))
+        before = checksum(api)
+
+        @api.errorhandler(ValueError)
+        def handle_value_error(error):
+            '''A documented value error'''
+            return {}, 400
+
+        assert checksum(api) != before
+
+
+class SpecsFileTest(object):
+    def export(self, tmpdir):
+        from flask import Flask
+        app = Flask(__name__)
+        setup_api(restplus.Api(app))
+        output = tmpdir.join('swagger.json')
+        app.test_cli_runner().invoke(args=['restplus', 'export', str(output)])
+        return str(output)
+
+    def test_load_specs_file(self, app, client, tmpdir, mocker):
+        specs_file = self.export(tmpdir)
+        setup_api(restplus.Api(app, specs_file=specs_file))
+        as_dict = mocker.spy(restplus.Swagger, 'as_dict')
+
+        specs = client.get_specs()
+
+        assert not as_dict.called
+        assert '/persons/' in specs['paths']
+        assert CHECKSUM_KEY not in specs
+
+    def test_outdated_specs_file(self, app, client, tmpdir, mocker):
+        specs_file = self.export(tmpdir)
+        api = setup_api(restplus.Api(app, specs_file=specs_file))
+        api.model('Other', {'name': restplus.fields.String})
+        as_dict = mocker.spy(restplus.Swagger, 'as_dict')
+        warning = mocker.patch('flask_restplus.api.log.warning')
+
+        specs = client.get_specs()
+
+        assert as_dict.called
+        assert warning.called
+        assert '/persons/' in specs['paths']
+
+    def test_missing_specs_file(self, app, client, tmpdir, mocker):
+        setup_api(restplus.Api(app, specs_file=str(tmpdir.join('missing.json'))))
+        warning = mocker.patch('flask_restplus.api.log.warning')
+
+        specs = client.get_specs()
+
+        assert warning.called
+        assert '/persons/' in specs['paths']
+
+    def test_checksum_error(self, app, client, tmpdir, mocker):
+        specs_file = self.export(tmpdir)
+        setup_api(restplus.Api(app, specs_file=specs_file))
+        mocker.patch('flask_restplus.api.checksum', side_effect=TypeError)
+        warning = mocker.patch('flask_restplus.api.log.warning')
+
+        specs = client.get_specs()
+
+        assert warning.called
+        assert '/persons/' in specs['paths']
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import copy
+import gc
+import weakref
+
 from collections import OrderedDict
 from datetime import date, datetime
 from decimal import Decimal
@@ -10,7 +14,7 @@ import pytz
 import pytest
 
 from flask import Blueprint
-from flask_restplus import fields, Api
+from flask_restplus import fields, marshal, Api
 
 
 class FieldTestCase(object):
@@ -179,6 +183,44 @@ class RawFieldTest(BaseFieldTestMixin, FieldTestCase):
         field = fields.Raw()
         assert field.output('bar.value', foo) == 42
 
+    def test_metadata_only_stored_when_given(self):
+        field = fields.String(attribute='bar', required=True)
+        assert field not in fields._METADATA
+        assert field.title is None
+        assert field.min_length is None
+
+        field = fields.String(title='A title', min_length=3)
+        assert fields._METADATA[field] == {'title': 'A title', 'min_length': 3}
+        assert fields.String.title is None
+
+    def test_no_instance_dict(self):
+        field = fields.String(title='A title', min_length=3)
+
+        assert field.__schema__ == {'type': 'string', 'title': 'A title', 'minLength': 3}
+        assert not hasattr(field, '__dict__')
+
+    def test_copy_keeps_metadata_but_not_schema(self):
+        field = fields.Integer(description='A number', min=1)
+        field.__schema__
+
+        clone = copy.copy(field)
+        clone.default = 42
+
+        assert clone.description == 'A number'
+        assert clone.minimum == 1
+        assert clone.__schema__['default'] == 42
+        assert 'default' not in field.__schema__
+        assert copy.deepcopy(field).__schema__ == field.__schema__
+
+    def test_slotted_attributes_are_cloned(self):
+        field = fields.List(fields.Raw, attribute='bar', default=[], title='A title', min_items=1)
+        clone = field.clone()
+        assert clone.container is field.container
+        assert clone.attribute == 'bar'
+        assert clone.default == []
+        assert clone.title == 'A title'
+        assert clone.min_items == 1
+
 
 class StringFieldTest(StringTestMixin, BaseFieldTestMixin, FieldTestCase):
     field_class = fields.String
@@ -635,6 +677,43 @@ class FormatedStringFieldTest(StringTestMixin, BaseFieldTestMixin, FieldTestCase
         field = fields.FormattedString('/foo/{0[account_sid]}/{0[sid]}/')
         self.assert_field_raises(field, (3, 4))
 
+    def test_nested_and_format_spec(self):
+        class User(object):
+            name = 'john'
+
+        field = fields.FormattedString('{user.name:>{width}}|{items[1]}')
+        assert field.output('foo', {'user': User(), 'width': 6, 'items': [1, 2]}) == '  john|2'
+
+    def test_object_attributes_are_not_copied(self, mocker):
+        class Obj(object):
+            def __init__(self):
+                self.sid = 3
+                self.account_sid = 4
+
+        to_marshallable_type = mocker.spy(fields, 'to_marshallable_type')
+        field = fields.FormattedString('/foo/{account_sid}/{sid}/')
+
+        assert field.output('foo', Obj()) == '/foo/4/3/'
+        assert not to_marshallable_type.called
+
+    def test_missing_value(self):
+        field = fields.FormattedString('{foo}')
+        with pytest.raises(KeyError):
+            field.output('foo', {'bar': 1})
+
+    def test_object_with_indexable_metaclass(self):
+        class Meta(type):
+            def __getitem__(cls, key):
+                return key
+
+        def __init__(self):
+            self.name = 'o'
+
+        obj = Meta(str('Obj'), (object, ), {'__init__': __init__})()
+        field = fields.FormattedString('{name}')
+
+        assert field.output('foo', obj) == 'o'
+
 
 class UrlFieldTest(StringTestMixin, BaseFieldTestMixin, FieldTestCase):
     field_class = partial(fields.Url, 'endpoint')
@@ -749,6 +828,33 @@ class UrlFieldTest(StringTestMixin, BaseFieldTestMixin, FieldTestCase):
         with app.test_request_context('/foo/foo', base_url='http://localhost'):
             assert 'https://localhost/foo/42' == field.output('foo', obj)
 
+    def test_built_from_template(self, app, mocker):
+        app.add_url_rule('/<int:id>/<name>', 'foobar', view_func=lambda x: x)
+        field = fields.Url('foobar', absolute=True)
+        url_for = mocker.patch('flask_restplus.fields.url_for')
+
+        with app.test_request_context('/', base_url='http://localhost/root/'):
+            assert field.output('foo', {'id': 42, 'name': 'a b/é'}) == 'http://localhost/root/42/a%20b/%C3%A9'
+
+        assert not url_for.called
+
+    def test_template_fallback(self, app):
+        def view(x):
+            return x
+
+        app.add_url_rule('/', 'foobar', view_func=view, defaults={'id': 1})
+        app.add_url_rule('/<int:id>', 'foobar', view_func=view)
+        app.add_url_rule('/<int:id>', 'single', view_func=lambda x: x)
+        field = fields.Url('foobar')
+
+        with app.test_request_context('/'):
+            assert field.from_template('foobar', {'id': 2}) is None
+            assert field.output('foo', {'id': 2}) == '/2'
+            assert field.from_template('single', {'id': 'x'}) is None
+            assert field.from_template('single', {'id': None}) is None
+            assert field.from_template('single', {'id': 3, '_external': True}) is None
+            assert field.from_template('single', {'id': 3}) == '/3'
+
 
 class NestedFieldTest(FieldTestCase):
     def test_defaults(self, api):
@@ -901,6 +1007,41 @@ class ListFieldTest(BaseFieldTestMixin, FieldTestCase):
         data = [1, 2, 'a']
         self.assert_field(field, data, data)
 
+    def test_primitives_formatted_in_bulk(self, mocker):
+        field = fields.List(fields.Integer(default=0))
+        # Slotted fields instances can't be patched
+        output = mocker.spy(fields.Raw, 'output')
+
+        self.assert_field(field, [1, '2', 3.5, None], [1, 2, 3, 0])
+        self.assert_field(fields.List(fields.String), (1, 'a', None), ['1', 'a', None])
+        self.assert_field(fields.List(fields.Boolean), [1, 'false', None], [True, False, None])
+        assert not output.called
+
+    def test_primitives_errors(self):
+        field = fields.List(fields.Integer)
+        with pytest.raises(fields.MarshallingError) as excinfo:
+            field.output('foo', {'foo': [1, 'two']})
+        assert 'value "two"' in str(excinfo.value)
+
+    def test_array(self):
+        import array
+
+        self.assert_field(fields.List(fields.Integer), array.array('i', [1, 2, 3]), [1, 2, 3])
+        self.assert_field(fields.List(fields.Raw), array.array('d', [1.5]), [1.5])
+
+    def test_generator(self):
+        field = fields.List(fields.Integer)
+        assert field.output('foo', {'foo': (i for i in range(3))}) == [0, 1, 2]
+
+    def test_numpy_arrays(self):
+        np = pytest.importorskip('numpy')
+
+        self.assert_field(fields.List(fields.Integer), np.arange(3), [0, 1, 2])
+        result = fields.List(fields.Raw).output('foo', {'foo': np.array([1.5, 2.5], dtype=np.float32)})
+        assert result == [1.5, 2.5]
+        assert all(type(value) is float for value in result)
+        self.assert_field(fields.List(fields.List(fields.Integer)), np.eye(2, dtype=int), [[1, 0], [0, 1]])
+
 
 class WildcardFieldTest(BaseFieldTestMixin, FieldTestCase):
     field_class = partial(fields.Wildcard, fields.String)
@@ -1036,6 +1177,43 @@ class WildcardFieldTest(BaseFieldTestMixin, FieldTestCase):
         assert expected1 == result1
         assert result2 == result1
 
+    def test_none_values_do_not_stop_wildcard(self):
+        wild = fields.Wildcard(fields.String, default='x')
+        data = {'a': 'x', 'b': None, 'c': 'c'}
+
+        assert marshal(data, {'*': wild}) == {'a': 'x', 'b': 'x', 'c': 'c'}
+
+    def test_wildcard_excludes_marshalled_keys(self):
+        model = OrderedDict([
+            ('a', fields.Integer),
+            ('*', fields.Wildcard(fields.String)),
+            ('b', fields.Integer),
+        ])
+        data = {'a': 1, 'b': 2, 'c': 3}
+
+        assert marshal(data, model) == {'a': 1, 'b': 2, 'c': '3'}
+
+    def test_wildcard_inline_and_shared(self):
+        wild = fields.Wildcard(fields.Integer)
+        model1 = {'*': wild}
+        model2 = {'name': fields.String, 'a*': wild}
+
+        assert marshal({'a': 1, 'b': 2}, model1) == {'a': 1, 'b': 2}
+        assert marshal({'name': 'n', 'ab': 1, 'b': 2}, model2) == {'name': 'n', 'ab': 1}
+        assert marshal({'c': 3}, {'*': fields.Wildcard(fields.Integer)}) == {'c': 3}
+
+    def test_wildcard_is_thread_safe(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        model = {'*': fields.Wildcard(fields.Integer)}
+
+        def marshal_keys(prefix):
+            data = dict(('{0}{1}'.format(prefix, i), i) for i in range(200))
+            return marshal(data, model) == data
+
+        with ThreadPoolExecutor(8) as executor:
+            assert all(executor.map(marshal_keys, ('k{0}-'.format(i) for i in range(32))))
+
 
 class ClassNameFieldTest(StringTestMixin, BaseFieldTestMixin, FieldTestCase):
     field_class = fields.ClassName
@@ -1076,6 +1254,17 @@ class ClassNameFieldTest(StringTestMixin, BaseFieldTestMixin, FieldTestCase):
         data = api.marshal({}, model)
         assert data == {'name': 'object'}
 
+    def test_cached_by_class(self, mocker):
+        camel_to_dash = mocker.patch('flask_restplus.fields.camel_to_dash', return_value='cached_class')
+        field = fields.ClassName(dash=True)
+
+        class CachedClass(object):
+            pass
+
+        assert field.output('name', CachedClass()) == 'cached_class'
+        assert field.output('name', CachedClass()) == 'cached_class'
+        assert camel_to_dash.call_count == 1
+
 
 class PolymorphTest(FieldTestCase):
     def test_polymorph_field(self, api):
@@ -1320,6 +1509,37 @@ class PolymorphTest(FieldTestCase):
             'extra2': 'extra2'
         }}
 
+    def test_polymorph_model_cached_by_class(self, api):
+        parent = api.model('Person', {'name': fields.String})
+        child1 = api.inherit('Child1', parent, {'extra1': fields.String})
+        child2 = api.inherit('Child2', parent, {'extra2': fields.String})
+
+        class Child1(object):
+            name = 'child1'
+            extra1 = 'extra1'
+
+        class GrandChild1(Child1):
+            name = 'grandchild1'
+
+        class Child2(object):
+            pass
+
+        field = fields.Polymorph({Child1: child1, Child2: child2})
+
+        assert field.model_for(Child1) is child1
+        assert field.model_for(GrandChild1) is child1
+        assert field.model_for(Child2) is child2
+
+        # The mapping is not scanned anymore for known classes
+        field.mapping = {}
+        assert field.model_for(GrandChild1) is child1
+        assert marshal({'owner': GrandChild1()}, {'owner': field}) == {'owner': {
+            'name': 'grandchild1',
+            'extra1': 'extra1'
+        }}
+        with pytest.raises(ValueError):
+            field.model_for(object)
+
 
 class CustomFieldTest(FieldTestCase):
     def test_custom_field(self):
@@ -1373,3 +1593,62 @@ class FieldsHelpersTest(object):
 
         obj = Test('hi')
         assert fields.get_value('value', obj) == 'hi'
+
+    def test_get_value_dotted_path(self):
+        class Foo(object):
+            def __init__(self):
+                self.bar = {'baz': 42}
+
+        assert fields.get_value('foo.bar.baz', {'foo': Foo()}) == 42
+
+    def test_get_value_dotted_path_missing(self):
+        assert fields.get_value('foo.bar', {'foo': None}) is None
+        assert fields.get_value('foo.bar', {}, default='x') == 'x'
+
+    def test_get_value_callable(self):
+        assert fields.get_value(lambda o: o['foo'] * 2, {'foo': 21}) == 42
+
+    def test_get_value_dict_method_fallback(self):
+        data = {'foo': 42}
+        assert fields.get_value('keys', data) == data.keys
+
+    def test_get_value_indexable_metaclass(self):
+        class Meta(type):
+            def __iter__(cls):
+                return iter(())
+
+        obj = Meta(str('Obj'), (object, ), {'value': 'hi'})()
+        assert fields._lookup_kind(obj) is fields._ATTR
+        assert fields.get_value('value', obj) == 'hi'
+
+    def test_types_are_not_kept_alive(self):
+        row = type(str('Row'), (object, ), {})
+        ref = weakref.ref(row)
+        assert fields.get_value('foo', row()) is None
+        assert fields.FormattedString('x').output('foo', row()) == 'x'
+        del row
+        gc.collect()
+
+        assert ref() is None
+
+    def test_accessor_is_cached(self):
+        assert fields.accessor('foo.bar') is fields.accessor('foo.bar')
+        assert fields.accessor('foo.bar')({'foo': {'bar': 42}}) == 42
+
+    def test_accessor_dynamic_attributes(self):
+        class Dynamic(object):
+            def __init__(self, indexable):
+                if indexable:
+                    self.__iter__ = lambda: iter(())
+
+            def __getitem__(self, key):
+                return 'item'
+
+            def __getattr__(self, key):
+                if key != 'foo':
+                    raise AttributeError(key)
+                return 'attr'
+
+        getter = fields.accessor('foo')
+        assert getter(Dynamic(indexable=True)) == 'item'
+        assert getter(Dynamic(indexable=False)) == 'attr'
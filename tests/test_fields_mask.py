@@ -6,7 +6,7 @@ import pytest
 
 from collections import OrderedDict
 
-from flask_restplus import mask, Api, Resource, fields, marshal, Mask
+from flask_restplus import mask, Api, Resource, fields, marshal, Mask, Model
 
 
 def assert_data(tested, expected):
@@ -472,6 +472,184 @@ class ApplyMaskTest(object):
             mask.apply(model, 'nested{notpossible}')
 
 
+class MaskedViewTest(object):
+    def test_reference_original_fields(self):
+        model = Model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+            'address': fields.Nested(Model('Address', {'city': fields.String, 'street': fields.String})),
+        })
+        view = mask.MaskedView(model, '{name,address{city}}')
+
+        assert list(view) == ['name', 'address']
+        assert 'age' not in view
+        assert view['name'] is model['name']
+        assert view['address'] is model['address']
+        assert isinstance(view.masks['address'], Mask)
+
+    def test_star(self):
+        model = {'name': fields.String, 'age': fields.Integer}
+        view = mask.MaskedView(model, '{age,*}')
+
+        assert list(view) == ['age', 'name']
+
+    def test_missing_fields_skipped(self):
+        view = mask.MaskedView({'name': fields.String}, '{name,missing}')
+
+        assert list(view) == ['name']
+
+    def test_raw_nested_dict(self):
+        nested = {'name': fields.String, 'age': fields.Integer}
+        view = mask.MaskedView({'nested': nested}, '{nested{name}}')
+
+        assert isinstance(view['nested'], mask.MaskedView)
+        assert list(view['nested']) == ['name']
+
+    def test_mask_error_on_simple_fields(self):
+        with pytest.raises(mask.MaskError):
+            mask.MaskedView({'name': fields.String}, 'name{notpossible}')
+
+    def test_mask_error_on_nested_model(self):
+        model = {'nested': fields.Nested(Model('Nested', {'name': fields.String}))}
+
+        with pytest.raises(mask.MaskError):
+            mask.MaskedView(model, 'nested{name{notpossible}}')
+
+    def test_marshal_does_not_clone_fields(self, mocker):
+        model = Model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+            'pets': fields.List(fields.Nested(Model('Pet', {'name': fields.String, 'age': fields.Integer}))),
+        })
+        data = {'name': 'John', 'age': 42, 'pets': [{'name': 'Rex', 'age': 3}]}
+        clone = mocker.patch.object(fields.Nested, 'clone')
+
+        assert marshal(data, model, mask='name,pets{name}') == {'name': 'John', 'pets': [{'name': 'Rex'}]}
+        assert not clone.called
+
+    def test_marshal_custom_nested_without_mask_argument(self):
+        class MyNested(fields.Nested):
+            def output(self, key, obj, **kwargs):
+                return super(MyNested, self).output(key, obj)
+
+        child = Model('Child', {'a': fields.String, 'secret': fields.String})
+        model = Model('Parent', {'c': MyNested(child), 'l': fields.List(MyNested(child))})
+        data = {'c': {'a': 'x', 'secret': 's'}, 'l': [{'a': 'y', 'secret': 's'}]}
+
+        assert marshal(data, model, mask='c{a},l{a}') == {'c': {'a': 'x'}, 'l': [{'a': 'y'}]}
+        view = mask.MaskedView(model, 'c{a},l{a}')
+        assert isinstance(view['c'], MyNested)
+        assert view['c'] is not model['c']
+        assert view.masks == {}
+
+    def test_marshal_wildcard_model_with_nested_mask(self):
+        row = Model('Row', {'name': fields.String, 'age': fields.Integer})
+        model = OrderedDict([
+            ('rows', fields.List(fields.Nested(row))),
+            ('*', fields.Wildcard(fields.String)),
+        ])
+        data = {'rows': [{'name': 'John', 'age': 42}], 'extra': 'value'}
+
+        assert marshal(data, model, mask='{rows{name}}') == {'rows': [{'name': 'John'}]}
+        assert marshal([data], model, mask='{rows{name},*}') == [{'rows': [{'name': 'John'}], 'extra': 'value'}]
+
+    def test_nested_view_cached_on_resolved_model(self):
+        mask.cache.clear()
+        nested = Model('Nested', {'name': fields.String, 'age': fields.Integer})
+        model = Model('Parent', {'nested': fields.Nested(nested)})
+
+        data = {'nested': {'name': 'John', 'age': 42}}
+        assert marshal(data, model, mask='nested{name}') == {'nested': {'name': 'John'}}
+        # The nested view warmed up on mask parsing is the one used at output time
+        assert mask.cache.misses == 2
+        assert mask.cache.hits == 1
+
+
+class MaskCacheTest(object):
+    def factory(self, model, mask):
+        return object()
+
+    def test_hits_and_misses(self):
+        cache = mask.MaskCache()
+        model = {'name': fields.String}
+        first = cache.get(model, '{name}', self.factory)
+        second = cache.get(model, '{name}', self.factory)
+
+        assert first is second
+        assert cache.info() == {'hits': 1, 'misses': 1, 'size': mask.DEFAULT_CACHE_SIZE, 'length': 1}
+
+    def test_keyed_on_fields_identity(self):
+        cache = mask.MaskCache()
+        first = cache.get({'name': fields.String}, 'name', self.factory)
+        second = cache.get({'name': fields.String}, 'name', self.factory)
+
+        assert first is not second
+        assert len(cache) == 2
+
+    def test_keyed_on_parsed_mask_identity(self):
+        cache = mask.MaskCache()
+        model = {'name': fields.String}
+        parsed = Mask('name')
+
+        assert cache.get(model, parsed, self.factory) is cache.get(model, parsed, self.factory)
+        assert cache.get(model, Mask('name'), self.factory) is not cache.get(model, parsed, self.factory)
+
+    def test_evict_least_recently_used(self):
+        cache = mask.MaskCache(size=2)
+        model = {'name': fields.String, 'age': fields.Integer}
+        name = cache.get(model, 'name', self.factory)
+        cache.get(model, 'age', self.factory)
+        cache.get(model, 'name', self.factory)
+        cache.get(model, 'name,age', self.factory)
+
+        assert len(cache) == 2
+        assert cache.get(model, 'name', self.factory) is name
+        assert cache.misses == 3
+        assert cache.get(model, 'age', self.factory)
+        assert cache.misses == 4
+
+    def test_disabled(self):
+        cache = mask.MaskCache(size=0)
+        model = {'name': fields.String}
+
+        assert cache.get(model, 'name', self.factory) is not cache.get(model, 'name', self.factory)
+        assert len(cache) == 0
+
+    def test_resize(self):
+        cache = mask.MaskCache()
+        model = {'name': fields.String, 'age': fields.Integer}
+        for m in ('name', 'age', 'name,age'):
+            cache.get(model, m, self.factory)
+        cache.resize(1)
+
+        assert len(cache) == 1
+        assert cache.size == 1
+
+    def test_parse_error_is_not_cached(self):
+        cache = mask.MaskCache()
+        model = {'name': fields.String}
+
+        for _ in range(2):
+            with pytest.raises(mask.ParseError):
+                cache.get(model, '{name', lambda f, m: Mask(m))
+        assert len(cache) == 0
+
+    def test_marshal_reuse_masked_fields(self):
+        mask.cache.clear()
+        model = Model('Person', {'name': fields.String, 'age': fields.Integer})
+
+        assert marshal({'name': 'John', 'age': 42}, model, mask='name') == {'name': 'John'}
+        assert marshal({'name': 'Jane', 'age': 24}, model, mask='name') == {'name': 'Jane'}
+        assert mask.cache.hits == 1
+        assert mask.cache.misses == 1
+
+    def test_size_from_config(self, app):
+        app.config['RESTPLUS_MASK_CACHE_SIZE'] = 7
+        Api(app)
+        assert mask.cache.size == 7
+        mask.cache.resize(mask.DEFAULT_CACHE_SIZE)
+
+
 class MaskAPI(object):
     def test_marshal_with_honour_field_mask_header(self, app, client):
         api = Api(app)
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import json
 import pytest
 
 from flask_restplus import (
-    marshal, marshal_with, marshal_with_field, fields, Api, Resource
+    marshal, marshal_json, marshal_many, marshal_with, marshal_with_field, fields, Api, Model, Resource
 )
+from flask_restplus import marshalling
+from flask_restplus.marshalling import Marshalled, Plan
 
 from collections import OrderedDict
 
@@ -388,6 +391,91 @@ class MarshallingTest(object):
                                 ('bar', OrderedDict([('a', 1), ('b', 2)]))])
         assert output == expected
 
+    def test_marshal_model_plan_is_cached(self):
+        model = Model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+        })
+        first = marshal({'name': 'John', 'age': '42'}, model)
+        plan = model.resolved.__plan__
+        second = marshal({'name': 'Jane', 'age': 24}, model)
+
+        assert first == {'name': 'John', 'age': 42}
+        assert second == {'name': 'Jane', 'age': 24}
+        assert model.resolved.__plan__ is plan
+        assert isinstance(plan, Plan)
+        assert [key for key, _, _ in plan.entries] == list(model.resolved.keys())
+
+    def test_marshal_masked_model_does_not_cache_plan(self):
+        model = Model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+        })
+        output = marshal({'name': 'John', 'age': 42}, model, mask='name')
+
+        assert output == {'name': 'John'}
+        assert not hasattr(model.resolved, '__plan__')
+
+    def test_plan_instanciate_field_classes_once(self):
+        plan = Plan(OrderedDict([('foo', fields.Raw), ('bar', {'baz': fields.Raw})]))
+
+        assert not plan.has_wildcards
+        (foo, foo_output, foo_nested), (bar, bar_output, bar_nested) = plan.entries
+        assert isinstance(foo_output.__self__, fields.Raw)
+        assert foo_nested is None
+        assert bar_output is None
+        assert bar_nested == {'baz': fields.Raw}
+        assert plan.marshal({'foo': 1, 'baz': 2}) == {'foo': 1, 'bar': {'baz': 2}}
+
+    def test_plan_detect_wildcards(self):
+        plan = Plan({'*': fields.Wildcard(fields.String)})
+        assert plan.has_wildcards
+
+    def test_marshal_many(self):
+        model = OrderedDict([('foo', fields.Raw), ('bar', fields.Integer)])
+        data = [{'foo': 'a', 'bar': '1', 'baz': 0}, {'foo': 'b', 'bar': 2}]
+        output = marshal_many(data, model)
+        assert output == [{'foo': 'a', 'bar': 1}, {'foo': 'b', 'bar': 2}]
+
+    def test_marshal_many_with_envelope_and_skip_none(self):
+        model = OrderedDict([('foo', fields.Raw), ('bar', fields.Raw)])
+        data = [{'foo': 'a'}, {'foo': 'b', 'bar': None}]
+        output = marshal_many(data, model, envelope='data', skip_none=True, ordered=True)
+        assert output == OrderedDict([('data', [OrderedDict([('foo', 'a')]), OrderedDict([('foo', 'b')])])])
+
+    def test_marshal_many_with_mask(self):
+        model = Model('Person', {'name': fields.String, 'age': fields.Integer})
+        data = [{'name': 'John', 'age': 42}, {'name': 'Jane', 'age': 24}]
+        output = marshal_many(data, model, mask='name')
+        assert output == [{'name': 'John'}, {'name': 'Jane'}]
+
+    def test_marshal_many_nested_lists(self):
+        model = {'foo': fields.Raw}
+        output = marshal_many([{'foo': 1}, [{'foo': 2}, {'foo': 3}]], model)
+        assert output == [{'foo': 1}, [{'foo': 2}, {'foo': 3}]]
+
+    def test_marshal_many_with_wildcard(self):
+        model = OrderedDict([('foo', fields.Raw), ('*', fields.Wildcard(fields.String))])
+        output = marshal_many([{'foo': 1, 'bar': 2}, {'foo': 3, 'baz': 4}], model)
+        assert output == [{'foo': 1, 'bar': '2'}, {'foo': 3, 'baz': '4'}]
+
+    def test_marshal_many_columns(self):
+        model = OrderedDict([('name', fields.String), ('age', fields.Integer)])
+        columns = {'name': ['John', 'Jane'], 'age': ('42', 24), 'extra': [1, 2]}
+        output = marshal_many(columns, model)
+        assert output == [{'name': 'John', 'age': 42}, {'name': 'Jane', 'age': 24}]
+
+    def test_marshal_decorator_list_use_marshal_many(self, mocker):
+        model = OrderedDict([('foo', fields.Raw)])
+        spy = mocker.spy(marshalling, 'marshal_many')
+
+        @marshal_with(model)
+        def try_me():
+            return [{'foo': 'bar'}, {'foo': 'baz'}], 201
+
+        assert try_me() == ([{'foo': 'bar'}, {'foo': 'baz'}], 201, {})
+        assert spy.call_count == 1
+
     @pytest.mark.options(debug=True)
     def test_will_prettyprint_json_in_debug_mode(self, app, client):
         api = Api(app)
@@ -427,3 +515,166 @@ class MarshallingTest(object):
         resp = client.get('/api')
         assert resp.status_code == 200
         assert resp.data.decode('utf-8') == '{"foo": 3.0}\n'
+
+    def test_marshal_list_with_stream(self, app):
+        api = Api(app)
+        model = api.model('Person', {'name': fields.String, 'age': fields.Integer})
+        consumed = []
+
+        def people():
+            for idx in range(3):
+                consumed.append(idx)
+                yield {'name': 'person-{0}'.format(idx), 'age': str(idx)}
+
+        @api.route('/people')
+        class People(Resource):
+            @api.marshal_list_with(model, stream=True)
+            def get(self):
+                return people()
+
+        # The client fixture preserves the request context kept alive by the stream
+        response = app.test_client().get('/people')
+        assert response.status_code == 200
+        assert response.content_type == 'application/json'
+        assert response.is_streamed
+        assert json.loads(response.data.decode('utf8')) == [
+            {'name': 'person-0', 'age': 0},
+            {'name': 'person-1', 'age': 1},
+            {'name': 'person-2', 'age': 2},
+        ]
+        assert consumed == [0, 1, 2]
+        response.close()
+
+    def test_marshal_list_with_stream_and_mask(self, app):
+        api = Api(app)
+        model = api.model('Person', {'name': fields.String, 'age': fields.Integer})
+
+        @api.route('/people')
+        class People(Resource):
+            @api.marshal_list_with(model, stream=True)
+            def get(self):
+                return iter([{'name': 'John', 'age': 42}])
+
+        data = app.test_client().get_json('/people', headers={'X-Fields': 'name'})
+        assert data == [{'name': 'John'}]
+
+    def test_marshal_list_with_stream_empty(self, app):
+        api = Api(app)
+        model = api.model('Person', {'name': fields.String})
+
+        @api.route('/people')
+        class People(Resource):
+            @api.marshal_list_with(model, stream=True)
+            def get(self):
+                return iter([])
+
+        assert app.test_client().get_json('/people') == []
+
+    def test_marshal_with_stream_and_envelope(self):
+        with pytest.raises(ValueError):
+            marshal_with({'foo': fields.Raw}, envelope='data', stream=True)
+
+    def test_marshal_json(self):
+        model = Model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+            'score': fields.Float,
+            'active': fields.Boolean,
+            'birthdate': fields.Date,
+            'tags': fields.List(fields.String),
+            'extra': fields.Raw,
+            'address': fields.Nested(Model('Address', {'city': fields.String}), allow_null=True),
+            'pets': fields.List(fields.Nested(Model('Pet', {'name': fields.String}))),
+            'nested': {'value': fields.Integer},
+        })
+        data = {
+            'name': 'Jérôme "J"',
+            'age': '42',
+            'score': 4.5,
+            'active': 1,
+            'birthdate': '2011-01-01',
+            'tags': ('a', 'b'),
+            'extra': {'key': [1, None]},
+            'pets': [{'name': 'Rex'}, None],
+            'value': 3,
+        }
+
+        output = marshal_json(data, model)
+
+        assert isinstance(output, bytes)
+        assert json.loads(output.decode('utf8')) == json.loads(json.dumps(marshal(data, model)))
+        assert output.startswith(b'{"name":"J\\u00e9r\\u00f4me \\"J\\"","age":42,')
+
+    def test_marshal_json_with_envelope_skip_none_and_mask(self):
+        model = Model('Person', {
+            'name': fields.String,
+            'age': fields.Integer,
+            'address': fields.Nested(Model('Address', {'city': fields.String, 'zip': fields.String})),
+        })
+        data = [{'name': 'John', 'age': 42, 'address': {'city': 'Paris'}}, {'age': 24}]
+
+        output = marshal_json(data, model, envelope='people', skip_none=True, mask='name,address{city}')
+        expected = marshal(data, model, envelope='people', skip_none=True, mask='name,address{city}')
+
+        assert json.loads(output.decode('utf8')) == expected
+
+    def test_marshal_json_with_wildcard(self):
+        wild = fields.Wildcard(fields.String)
+        output = marshal_json({'a': 1, 'b': 'b'}, {'*': wild})
+
+        assert json.loads(output.decode('utf8')) == {'a': '1', 'b': 'b'}
+
+    def test_marshal_json_encoders_are_compiled_once(self):
+        model = Model('Person', {'name': fields.String})
+        marshal_json({'name': 'John'}, model)
+        encoders = model.resolved.__plan__.encoders
+
+        marshal_json({'name': 'Jane'}, model)
+        assert model.resolved.__plan__.encoders is encoders
+
+    def test_marshal_decorator_fused(self):
+        fields_ = {'foo': fields.Raw}
+
+        @marshal_with(fields_, envelope='data', fused=True)
+        def try_me():
+            return {'foo': 'bar', 'bat': 'baz'}
+
+        result = try_me()
+        assert isinstance(result, Marshalled)
+        assert result.marshal() == {'data': {'foo': 'bar'}}
+        assert result.to_json() == b'{"data":{"foo":"bar"}}'
+
+    def test_marshal_with_stream_and_fused(self):
+        with pytest.raises(ValueError):
+            marshal_with({'foo': fields.Raw}, stream=True, fused=True)
+
+    def test_marshal_with_fused_response(self, app, client):
+        api = Api(app)
+        model = api.model('Person', {'name': fields.String, 'age': fields.Integer})
+
+        @api.route('/people')
+        class People(Resource):
+            @api.marshal_list_with(model, fused=True)
+            def get(self):
+                return [{'name': 'John', 'age': '42'}], 200, {'X-Custom': 'value'}
+
+        response = client.get('/people')
+        assert response.status_code == 200
+        assert response.content_type == 'application/json'
+        assert response.headers['X-Custom'] == 'value'
+        assert response.data == b'[{"name":"John","age":42}]\n'
+
+    def test_marshal_with_fused_honour_json_settings(self, app, client):
+        app.config['RESTPLUS_JSON'] = {'indent': 2}
+        api = Api(app)
+        model = api.model('Person', {'name': fields.String})
+
+        @api.route('/person')
+        class Person(Resource):
+            @api.marshal_with(model, fused=True)
+            def get(self):
+                return {'name': 'John'}
+
+        response = client.get('/person')
+        assert response.status_code == 200
+        assert response.data.decode('utf8') == '{\n  "name": "John"\n}\n'
@@ -6,7 +6,7 @@ import pytest
 
 from collections import OrderedDict
 
-from flask_restplus import fields, Model, OrderedModel, SchemaModel
+from flask_restplus import fields, marshal, Model, OrderedModel, SchemaModel
 
 
 class ModelTest(object):
@@ -428,6 +428,43 @@ class ModelTest(object):
             'type': 'object'
         }
 
+    def test_clone_shares_unchanged_fields(self):
+        parent = Model('Parent', {
+            'name': fields.String(required=True),
+            'age': fields.Integer,
+            'birthdate': fields.DateTime(),
+        })
+
+        child = parent.clone('Child', partial=('name', 'age', 'birthdate'), optional='name', required='age')
+
+        assert child['birthdate'] is parent['birthdate']
+        assert child['name'] is not parent['name']
+        assert not child['name'].required
+        assert parent['name'].required
+        assert parent.__schema__['required'] == ['name']
+        assert child.__schema__['required'] == ['age']
+        # Fields classes are instanciated, never modified
+        assert child['age'].required
+        assert fields.Integer().required is None
+
+    def test_resolved_shares_fields(self):
+        parent = Model('Person', {
+            'name': fields.String(discriminator=True),
+            'age': fields.Integer,
+        })
+        child = parent.inherit('Child', {
+            'extra': fields.String,
+        })
+
+        assert parent.resolved['age'] is parent['age']
+        assert child.resolved['age'] is parent['age']
+        assert child.resolved['extra'] is child['extra']
+        # The discriminator is copied to output each model name
+        assert parent.resolved['name'].default == 'Person'
+        assert child.resolved['name'].default == 'Child'
+        assert parent['name'].default is None
+        assert parent['name'].__schema__ == {'type': 'string'}
+
     def test_inherit_from_instance(self):
         parent = Model('Parent', {
             'name': fields.String,
@@ -615,6 +652,137 @@ class ModelTest(object):
         with pytest.raises(BadRequest):
             model.validate(data, format_checker=FormatChecker())
 
+    def test_validator_is_cached(self):
+        from jsonschema import FormatChecker, RefResolver
+
+        model = Model('MyModel', {'name': fields.String})
+        resolver = RefResolver.from_schema({})
+        checker = FormatChecker()
+
+        assert model.validator() is model.validator()
+        assert model.validator(resolver, checker) is model.validator(resolver, checker)
+        assert model.validator(resolver, checker) is not model.validator(resolver)
+        assert model.validator(resolver, checker) is not model.validator(None, checker)
+
+    @pytest.mark.parametrize('mutate', [
+        lambda m: m.__setitem__('age', fields.Integer(required=True)),
+        lambda m: m.update(age=fields.Integer(required=True)),
+        lambda m: m.setdefault('age', fields.Integer(required=True)),
+        lambda m: m.pop('name'),
+        lambda m: m.__delitem__('name'),
+        lambda m: m.clear(),
+    ])
+    @pytest.mark.parametrize('model_class', [Model, OrderedModel])
+    def test_validator_invalidated_on_mutation(self, model_class, mutate):
+        model = model_class('MyModel', {'name': fields.String(required=True)})
+        validator = model.validator()
+
+        mutate(model)
+
+        assert model.validator() is not validator
+        assert model.validator().schema == model.__schema__
+
+    def test_schema_is_cached(self):
+        parent = Model('Parent', {'name': fields.String})
+        model = parent.inherit('Child', {'age': fields.Integer})
+
+        assert parent.__schema__ is parent.__schema__
+        assert model.__schema__ is model.__schema__
+
+    @pytest.mark.parametrize('mutate', [
+        lambda m: m.__setitem__('age', fields.Integer(required=True)),
+        lambda m: m.update(age=fields.Integer(required=True)),
+        lambda m: m.pop('name'),
+        lambda m: m.clear(),
+    ])
+    @pytest.mark.parametrize('model_class', [Model, OrderedModel])
+    def test_schema_invalidated_on_mutation(self, model_class, mutate):
+        model = model_class('MyModel', {'name': fields.String(required=True)})
+        schema = model.__schema__
+
+        mutate(model)
+
+        assert model.__schema__ is not schema
+        assert model.__schema__ == model_class('MyModel', model).__schema__
+
+    def test_resolved_invalidated_on_mutation(self):
+        model = Model('MyModel', {'name': fields.String})
+        assert marshal({'name': 'n', 'age': 42}, model) == {'name': 'n'}
+
+        model['age'] = fields.Integer
+
+        assert marshal({'name': 'n', 'age': 42}, model) == {'name': 'n', 'age': 42}
+
+    def test_validator_explicit_invalidation(self):
+        from werkzeug.exceptions import BadRequest
+
+        model = Model('MyModel', {'name': fields.String()})
+        model.validate({})
+
+        model['name'].required = True
+        model.invalidate()
+
+        with pytest.raises(BadRequest):
+            model.validate({})
+
+    @pytest.mark.parametrize('compiled', [False, True])
+    def test_validate_single_pass(self, mocker, compiled):
+        from werkzeug.exceptions import BadRequest
+
+        model = Model('MyModel', {'name': fields.String(required=True), 'age': fields.Integer})
+        validator = model.validator(compiled=compiled)
+        spy = mocker.spy(validator, 'iter_errors')
+
+        data = {'age': 'ten'}
+
+        with pytest.raises(BadRequest) as excinfo:
+            model.validate(data, compiled=compiled)
+
+        # jsonschema recursively calls iter_errors on nested instances
+        assert len([call for call in spy.call_args_list if call[0][0] is data]) == 1
+        assert excinfo.value.data['errors'] == {
+            'name': "'name' is a required property",
+            'age': "'ten' is not of type 'integer'",
+        }
+
+    @pytest.mark.parametrize('compiled', [False, True])
+    def test_validate_max_errors(self, compiled):
+        from werkzeug.exceptions import BadRequest
+
+        model = Model('MyModel', dict(('f{0}'.format(i), fields.Integer(required=True)) for i in range(10)))
+
+        with pytest.raises(BadRequest) as excinfo:
+            model.validate({}, compiled=compiled, max_errors=3)
+
+        assert len(excinfo.value.data['errors']) == 3
+
+    @pytest.mark.parametrize('compiled', [False, True])
+    @pytest.mark.parametrize('workers', [None, 3])
+    def test_validate_many(self, compiled, workers):
+        from concurrent.futures import ThreadPoolExecutor
+        from werkzeug.exceptions import BadRequest
+
+        model = Model('MyModel', {'name': fields.String(required=True), 'age': fields.Integer(default=18)})
+        data = [{'name': str(i)} for i in range(10)]
+        executor = ThreadPoolExecutor(workers) if workers else None
+
+        model.validate_many(data, compiled=compiled, executor=executor, chunk_size=3)
+        assert all(item['age'] == 18 for item in data)
+
+        data[3] = {'age': 'x'}
+        data[8] = {}
+        with pytest.raises(BadRequest) as excinfo:
+            model.validate_many(data, compiled=compiled, executor=executor, chunk_size=3)
+        assert excinfo.value.data['errors'] == {
+            '3.name': "'name' is a required property",
+            '3.age': "'x' is not of type 'integer'",
+            '8.name': "'name' is a required property",
+        }
+
+        with pytest.raises(BadRequest) as excinfo:
+            model.validate_many(data, compiled=compiled, max_errors=2, executor=executor, chunk_size=3)
+        assert set(excinfo.value.data['errors']) == set(['3.name', '3.age'])
+
 
 class ModelSchemaTestCase(object):
     def test_model_schema(self):
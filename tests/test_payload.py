@@ -228,6 +228,98 @@ class PayloadTest(object):
             'members': [{'name': 'Jonn'}, {'age': 42}]
         }, 'members.0.age', 'members.1.name')
 
+    def test_validation_does_not_render_specs(self, app, client, mocker):
+        api = restplus.Api(app, validate=True)
+        as_dict = mocker.spy(restplus.Swagger, 'as_dict')
+
+        person = api.model('Person', {'name': restplus.fields.String(required=True)})
+        family = api.model('Family', {'members': restplus.fields.List(restplus.fields.Nested(person))})
+
+        @api.route('/validation/')
+        class Payload(restplus.Resource):
+            @api.expect(family)
+            def post(self):
+                return {}
+
+        self.assert_errors(client, '/validation/', {'members': [{}]}, 'members.0.name')
+        assert not as_dict.called
+
+        # Models registered afterward are resolvable
+        pet = api.model('Pet', {'name': restplus.fields.String(required=True)})
+        zoo = api.model('Zoo', {'pets': restplus.fields.List(restplus.fields.Nested(pet))})
+
+        @api.route('/zoo/')
+        class Zoo(restplus.Resource):
+            @api.expect(zoo)
+            def post(self):
+                return {}
+
+        self.assert_errors(client, '/zoo/', {'pets': [{}]}, 'pets.0.name')
+        assert not as_dict.called
+
+    def test_compiled_validation(self, app, client):
+        '''It should perform validation with compiled validators'''
+        api = restplus.Api(app, validate=True, compile_validators=True)
+
+        person = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+            'age': restplus.fields.Integer(default=18),
+        })
+
+        family = api.model('Family', {
+            'name': restplus.fields.String(required=True),
+            'members': restplus.fields.List(restplus.fields.Nested(person)),
+        })
+
+        @api.route('/validation/')
+        class Payload(restplus.Resource):
+            @api.expect(family)
+            def post(self):
+                return api.payload
+
+        data = client.post_json('/validation/', {'name': 'Doe', 'members': [{'name': 'John', 'unknown': 1}]})
+        assert data == {'name': 'Doe', 'members': [{'name': 'John', 'age': 18}]}
+
+        self.assert_errors(client, '/validation/', {
+            'members': [{'name': 'Jonn', 'age': '42'}, {'age': 42}]
+        }, 'name', 'members.0.age', 'members.1.name')
+
+    def test_compiled_validation_in_config(self, app, client):
+        app.config['RESTPLUS_COMPILE_VALIDATORS'] = True
+        api = restplus.Api(app, validate=True)
+
+        assert api._compile_validators is True
+
+    def test_validation_max_errors_in_config(self, app, client):
+        app.config['RESTPLUS_VALIDATION_MAX_ERRORS'] = 2
+        api = restplus.Api(app, validate=True)
+
+        fields = api.model('Person', {
+            'name': restplus.fields.String(required=True),
+            'age': restplus.fields.Integer(required=True),
+            'birthdate': restplus.fields.DateTime(required=True),
+        })
+
+        @api.route('/validation/')
+        class ValidationOn(restplus.Resource):
+            @api.expect(fields)
+            def post(self):
+                return {}
+
+        out = client.post_json('/validation/', {}, status=400)
+        assert len(out['errors']) == 2
+
+    def test_expect_validation_collection_with_workers(self, app, client):
+        app.config['RESTPLUS_VALIDATION_WORKERS'] = 2
+        app.config['RESTPLUS_VALIDATION_CHUNK_SIZE'] = 2
+        self._setup_expect_validation_collection_resource_tests(app)
+
+        data = [{'username': 'user{0}'.format(i)} for i in range(5)]
+        client.post_json('/validation/', data)
+
+        data[4]['username'] = 4
+        self.assert_errors(client, '/validation/', data, '4.username')
+
     def _setup_expect_validation_single_resource_tests(self, app):
         # Setup a minimal Api with endpoint that expects in input payload
         # a single object of a resource
@@ -308,7 +400,7 @@ class PayloadTest(object):
         self.assert_errors(client, '/validation/', [
             {'username': 'alice'},
             {'username': 123}
-        ], 'username')
+        ], '1.username')
 
     def test_validation_with_propagate(self, app, client):
         app.config['PROPAGATE_EXCEPTIONS'] = True
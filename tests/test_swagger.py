@@ -44,6 +44,54 @@ class SwaggerTest(object):
         assert 'application/json' in data['produces']
         assert 'application/xml' in data['produces']
 
+    def test_specs_endpoint_serialized_once(self, api, client, mocker):
+        dumps = mocker.spy(restplus.api, 'dumps')
+
+        first = client.get('/swagger.json')
+        second = client.get('/swagger.json')
+
+        assert dumps.call_count == 1
+        assert first.data == second.data
+        assert first.headers['ETag'] == second.headers['ETag']
+        assert not first.headers['ETag'].startswith('W/')
+        # The serialization time differs between processes
+        assert 'Last-Modified' not in first.headers
+
+    def test_specs_endpoint_not_modified(self, api, client):
+        response = client.get('/swagger.json')
+        etag = response.headers['ETag']
+
+        response = client.get('/swagger.json', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+        response = client.get('/swagger.json', headers={'If-None-Match': '"other"'})
+        assert response.status_code == 200
+
+    def test_specs_endpoint_compressed(self, app, api, client):
+        import gzip
+        import json
+
+        app.config['RESTPLUS_SWAGGER_COMPRESS'] = True
+        plain = client.get('/swagger.json')
+        response = client.get('/swagger.json', headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in plain.headers
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert response.headers['ETag'] != plain.headers['ETag']
+        assert json.loads(gzip.decompress(response.data).decode('utf8')) == json.loads(plain.data.decode('utf8'))
+
+    def test_specs_endpoint_compression_is_reproducible(self, app, api, client, mocker):
+        app.config['RESTPLUS_SWAGGER_COMPRESS'] = True
+        first = client.get('/swagger.json', headers={'Accept-Encoding': 'gzip'})
+        api._serialized_schemas.clear()
+        mocker.patch('time.time', return_value=1e9)
+        second = client.get('/swagger.json', headers={'Accept-Encoding': 'gzip'})
+
+        assert first.data == second.data
+        assert first.headers['ETag'] == second.headers['ETag']
+
     def test_specs_endpoint_info(self, app, client):
         api = restplus.Api(version='1.0',
             title='My API',
@@ -3102,3 +3150,207 @@ class SwaggerDeprecatedTest(object):
 
         assert 'body' not in ModelAsDict.post.__apidoc__
         assert ModelAsDict.post.__apidoc__['expect'] == [(fields, 'Body description')]
+
+
+class SwaggerFragmentsTest(object):
+    def test_add_resource_regenerates_its_namespace_only(self, app, client, mocker):
+        api = restplus.Api(app)
+        ns1 = api.namespace('ns1')
+        ns2 = api.namespace('ns2')
+        person = api.model('Person', {'name': restplus.fields.String})
+
+        @ns1.route('/persons/')
+        class Persons(restplus.Resource):
+            @api.marshal_with(person)
+            def get(self):
+                return {}
+
+        @ns2.route('/things/')
+        class Things(restplus.Resource):
+            def get(self):
+                return {}
+
+        assert set(client.get_specs()['paths']) == set(['/ns1/persons/', '/ns2/things/'])
+        serialize_namespace = mocker.spy(restplus.Swagger, 'serialize_namespace')
+
+        @ns2.route('/others/')
+        class Others(restplus.Resource):
+            def get(self):
+                return {}
+
+        specs = client.get_specs()
+
+        assert set(specs['paths']) == set(['/ns1/persons/', '/ns2/things/', '/ns2/others/'])
+        assert 'Person' in specs['definitions']
+        assert [call[0][1] for call in serialize_namespace.call_args_list] == [ns2]
+
+    def test_add_namespace_after_rendering(self, app, client):
+        api = restplus.Api(app)
+
+        @api.route('/first/')
+        class First(restplus.Resource):
+            def get(self):
+                return {}
+
+        assert list(client.get_specs()['paths']) == ['/first/']
+
+        ns = restplus.Namespace('ns')
+        thing = ns.model('Thing', {'name': restplus.fields.String})
+
+        @ns.route('/things/')
+        class Things(restplus.Resource):
+            @ns.marshal_list_with(thing)
+            def get(self):
+                return []
+
+        api.add_namespace(ns, path='/things-ns')
+
+        specs = client.get_specs()
+        assert set(specs['paths']) == set(['/first/', '/things-ns/things/'])
+        assert 'Thing' in specs['definitions']
+        assert set(tag['name'] for tag in specs['tags']) == set(['default', 'ns'])
+
+
+class SwaggerNamespaceSpecsTest(object):
+    def setup_api(self, api):
+        address = api.model('Address', {'city': restplus.fields.String})
+        person = api.model('Person', {'address': restplus.fields.Nested(address)})
+        api.model('Unused', {'name': restplus.fields.String})
+        persons = api.namespace('persons', description='Persons')
+        things = api.namespace('things')
+
+        @persons.route('/')
+        class Persons(restplus.Resource):
+            @api.marshal_list_with(person)
+            def get(self):
+                return []
+
+        @things.route('/')
+        class Things(restplus.Resource):
+            def get(self):
+                return []
+
+        return api
+
+    def test_namespace_specs(self, app, client):
+        self.setup_api(restplus.Api(app))
+
+        specs = client.get_json('/swagger/namespaces/persons.json')
+
+        assert list(specs['paths']) == ['/persons/']
+        assert specs['tags'] == [{'name': 'persons', 'description': 'Persons'}]
+        assert set(specs['definitions']) == set(['Person', 'Address'])
+
+    def test_namespace_specs_without_definitions(self, app, client):
+        self.setup_api(restplus.Api(app))
+
+        specs = client.get_json('/swagger/namespaces/things.json')
+
+        assert list(specs['paths']) == ['/things/']
+        assert 'definitions' not in specs
+
+    def test_unknown_namespace_specs(self, app, client):
+        self.setup_api(restplus.Api(app))
+
+        response = client.get('/swagger/namespaces/unknown.json')
+        assert response.status_code == 404
+
+    def test_hidden_namespace_specs(self, app, client):
+        api = restplus.Api(app)
+        ns = api.namespace('hidden')
+
+        @ns.route('/')
+        @api.doc(False)
+        class Hidden(restplus.Resource):
+            def get(self):
+                return {}
+
+        response = client.get('/swagger/namespaces/hidden.json')
+        assert response.status_code == 404
+
+    def test_namespace_specs_are_conditional(self, app, client):
+        self.setup_api(restplus.Api(app))
+
+        response = client.get('/swagger/namespaces/persons.json')
+        etag = response.headers['ETag']
+
+        response = client.get('/swagger/namespaces/persons.json', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+    def test_specs_index(self, app, client):
+        self.setup_api(restplus.Api(app, version='1.0'))
+
+        index = client.get_json('/swagger/index.json')
+
+        assert index == {
+            'title': 'API',
+            'version': '1.0',
+            'specs': 'http://localhost/swagger.json',
+            'namespaces': [
+                {
+                    'name': 'persons',
+                    'description': 'Persons',
+                    'url': 'http://localhost/swagger/namespaces/persons.json',
+                },
+                {
+                    'name': 'things',
+                    'description': None,
+                    'url': 'http://localhost/swagger/namespaces/things.json',
+                },
+            ],
+        }
+
+    def test_namespace_specs_follow_new_resources(self, app, client):
+        api = self.setup_api(restplus.Api(app))
+        assert list(client.get_json('/swagger/namespaces/things.json')['paths']) == ['/things/']
+        things = api.namespaces[-1]
+
+        @things.route('/<id>')
+        class Thing(restplus.Resource):
+            def get(self, id):
+                return {}
+
+        specs = client.get_json('/swagger/namespaces/things.json')
+        assert set(specs['paths']) == set(['/things/', '/things/{id}'])
+
+    def test_namespace_specs_without_doc(self, app, client):
+        self.setup_api(restplus.Api(app, doc=False))
+
+        assert client.get('/swagger.json').status_code == 200
+        assert client.get('/swagger/index.json').status_code == 404
+        assert client.get('/swagger/namespaces/persons.json').status_code == 404
+
+    def test_namespace_specs_security(self, app, client):
+        api = restplus.Api(app, security='apikey', authorizations={
+            'apikey': {'type': 'apiKey', 'in': 'header', 'name': 'X-API'},
+            'oauth2': {'type': 'oauth2', 'flow': 'implicit', 'authorizationUrl': 'https://somewhere.com/auth'},
+            'basic': {'type': 'basic'},
+        })
+        public = api.namespace('public')
+        private = api.namespace('private', authorizations={'token': {'type': 'apiKey', 'in': 'query', 'name': 't'}})
+
+        @public.route('/')
+        class Public(restplus.Resource):
+            @api.doc(security=None)
+            def get(self):
+                return {}
+
+        @private.route('/')
+        class Private(restplus.Resource):
+            def get(self):
+                return {}
+
+            @api.doc(security='oauth2')
+            def post(self):
+                return {}
+
+        specs = client.get_json('/swagger/namespaces/public.json')
+        assert 'securityDefinitions' not in specs
+        assert 'security' not in specs
+
+        specs = client.get_json('/swagger/namespaces/private.json')
+        assert set(specs['securityDefinitions']) == set(['apikey', 'oauth2', 'token'])
+        assert specs['security'] == [{'apikey': []}]
+
+        specs = client.get_specs()
+        assert set(specs['securityDefinitions']) == set(['apikey', 'oauth2', 'basic', 'token'])
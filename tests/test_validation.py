@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import copy
+import pytest
+
+from jsonschema import FormatChecker, RefResolver
+
+from flask_restplus import fields, Model
+from flask_restplus.format import ExtendedDraft4Validator
+from flask_restplus.validation import CompiledValidator, UnsupportedSchema, iter_errors
+
+
+address = Model('Address', {
+    'street': fields.String(required=True, min_length=2),
+    'zip': fields.String(pattern=r'^\d+$'),
+})
+
+person = Model('Person', {
+    'name': fields.String(required=True, max_length=5),
+    'age': fields.Integer(min=0, max=150, exclusiveMax=True),
+    'score': fields.Float(min=0.5, exclusiveMin=True, multiple=0.5),
+    'kind': fields.String(enum=['a', 'b'], default='a'),
+    'tags': fields.List(fields.String(min_length=1), min_items=1, max_items=2),
+    'address': fields.Nested(address, required=True),
+    'addresses': fields.List(fields.Nested(address)),
+    'email': fields.String(format='email'),
+    'active': fields.Boolean(default=True),
+})
+
+child = person.inherit('Child', {'toy': fields.String(required=True)})
+
+RESOLVER = RefResolver.from_schema({
+    'definitions': dict((m.name, m._schema) for m in (address, person, child))
+})
+
+PAYLOADS = [
+    {},
+    {'name': 'bob', 'address': {'street': 'xy'}},
+    {'name': 'bob', 'address': {'street': 'xy'}, 'toy': 'ball'},
+    {
+        'name': 'roberto', 'age': 150, 'score': 0.5, 'kind': 'c', 'tags': [], 'email': 'nope',
+        'address': {'zip': 'ab'}, 'extra': 1,
+    },
+    {
+        'name': 3, 'age': True, 'score': 1.3, 'tags': ['', 3, 'x'], 'email': 'bob@example.com',
+        'addresses': [{'street': 'ok'}, {}],
+        'address': {'street': 'ab', 'zip': '12', 'unknown': 1},
+    },
+]
+
+
+class CompiledValidatorTest(object):
+    @pytest.mark.parametrize('model', [person, child])
+    @pytest.mark.parametrize('format_checker', [None, FormatChecker()])
+    @pytest.mark.parametrize('payload', PAYLOADS)
+    def test_same_errors_as_jsonschema(self, model, format_checker, payload):
+        expected_data, data = copy.deepcopy(payload), copy.deepcopy(payload)
+        reference = ExtendedDraft4Validator(model.__schema__, resolver=RESOLVER, format_checker=format_checker)
+        validator = CompiledValidator(model.__schema__, resolver=RESOLVER, format_checker=format_checker)
+
+        expected = sorted((model.format_error(e), e.validator) for e in reference.iter_errors(expected_data))
+        errors = sorted((model.format_error(e), e.validator) for e in validator.iter_errors(data))
+
+        assert errors == expected
+        assert data == expected_data
+
+    def test_inject_defaults_and_strip_unknown(self):
+        data = {'name': 'bob', 'address': {'street': 'xy', 'unknown': True}, 'unknown': True}
+
+        CompiledValidator(person.__schema__, resolver=RESOLVER).validate(data)
+
+        assert data == {
+            'name': 'bob',
+            'kind': 'a',
+            'active': True,
+            'address': {'street': 'xy'},
+        }
+
+    def test_validate_raises_first_error(self):
+        validator = CompiledValidator(person.__schema__, resolver=RESOLVER)
+
+        assert validator.is_valid({'name': 'bob', 'address': {'street': 'xy'}})
+        assert not validator.is_valid({'address': {'street': 'xy'}})
+        with pytest.raises(Exception) as excinfo:
+            validator.validate({'address': {'street': 'xy'}})
+        assert excinfo.value.validator == 'required'
+
+    @pytest.mark.parametrize('compiled', [False, True])
+    def test_iter_errors_max_errors(self, compiled):
+        validator_class = CompiledValidator if compiled else ExtendedDraft4Validator
+        validator = validator_class(person.__schema__, resolver=RESOLVER)
+        payload = {'name': 3, 'age': 'x', 'score': 'y', 'tags': 'z'}
+
+        assert len(list(iter_errors(validator, dict(payload)))) == 5
+        assert len(list(iter_errors(validator, dict(payload), max_errors=2))) == 2
+
+    def test_non_object_payload(self):
+        validator = CompiledValidator(person.__schema__, resolver=RESOLVER)
+
+        errors = list(validator.iter_errors(['not', 'an', 'object']))
+
+        assert [(e.validator, list(e.path)) for e in errors] == [('type', [])]
+
+    def test_recursive_reference(self):
+        node = Model('Node', {'name': fields.String(required=True)})
+        node['children'] = fields.List(fields.Nested(node))
+        resolver = RefResolver.from_schema({'definitions': {'Node': node._schema}})
+        validator = CompiledValidator(node.__schema__, resolver=resolver)
+
+        errors = list(validator.iter_errors({'name': 'root', 'children': [{'children': [{}]}]}))
+
+        assert sorted(node.format_error(e)[0] for e in errors) == ['children.0.children.0.name', 'children.0.name']
+
+    @pytest.mark.parametrize('schema', [
+        {'type': 'array', 'uniqueItems': True},
+        {'anyOf': [{'type': 'string'}, {'type': 'integer'}]},
+        {'type': 'object', 'additionalProperties': {'type': 'string'}},
+        {'enum': [0, 1]},
+        {'$ref': '#/definitions/Unknown'},
+    ])
+    def test_unsupported_schema(self, schema):
+        with pytest.raises(UnsupportedSchema):
+            CompiledValidator(schema)
+
+    def test_model_falls_back_on_jsonschema(self):
+        model = Model('Unique', {'tags': fields.List(fields.String, unique=True)})
+
+        assert isinstance(person.validator(RESOLVER, compiled=True), CompiledValidator)
+        assert isinstance(model.validator(compiled=True), ExtendedDraft4Validator)
+        assert isinstance(person.validator(RESOLVER), ExtendedDraft4Validator)